@@ -13,6 +13,11 @@ CANVAS_ACCOUNT_DOMAIN = os.getenv('CANVAS_ACCOUNT_DOMAIN')
 RESTCLIENTS_CANVAS_HOST = ("https://"
                            f"{os.getenv('STUDENTTRAINING_ACCOUNT_DOMAIN')}")
 
+# Live Canvas requests are throttled against the Canvas rate limit
+if globals().get('RESTCLIENTS_CANVAS_DAO_CLASS') == 'Live':
+    RESTCLIENTS_CANVAS_DAO_CLASS = (
+        'training_provisioner.dao.canvas.RateLimitedLiveDAO')
+
 if os.getenv('AUTH', 'NONE') == 'SAML_MOCK':
     MOCK_SAML_ATTRIBUTES = {
         'uwnetid': ['jstaff'],
@@ -58,8 +63,21 @@ else:
     if not all([EDW_HOST, EDW_USER, EDW_PASS]):
         raise ValueError("EDW connection parameters (EDW_HOST, EDW_USER, EDW_PASS) must be set in production environment")
 
-CACHES = {
-    "default": {
-        "BACKEND": "django.core.cache.backends.locmem.LocMemCache"
+# API tokens and enrollment responses are invalidated by signals in
+# whichever process changes them, so every process must share the cache
+MEMCACHED_SERVER_COUNT = int(os.getenv('MEMCACHED_SERVER_COUNT', 0))
+if MEMCACHED_SERVER_COUNT:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.memcached.PyMemcacheCache",
+            "LOCATION": [
+                os.getenv('MEMCACHED_SERVER_SPEC', '').format(n)
+                for n in range(MEMCACHED_SERVER_COUNT)],
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache"
+        }
     }
-}
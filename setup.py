@@ -28,8 +28,10 @@ setup(
         'uw-django-saml2~=1.8',
         'sqlalchemy~=2.0',
         'pandas~=2.1',
+        'numpy>=1.22',
         'pymssql~=2.2',
         'tenacity~=9.1',
+        'pymemcache~=4.0',
     ],
     license='Apache License, Version 2.0',
     description=('An application to manage Training course and enrollment '
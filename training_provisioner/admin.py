@@ -5,14 +5,50 @@ from django.conf import settings
 from django.contrib import admin
 from django.utils.decorators import method_decorator
 from django.contrib.auth.decorators import login_required
+from django.core.management import call_command
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
 from uw_saml.decorators import group_required
 from django.http import HttpResponseRedirect
 from django.urls import reverse
-from training_provisioner.models import Import
+from training_provisioner.models import Import, ImportResource
+from training_provisioner.models.course import Course
+from training_provisioner.models.import_message import ImportMessage
 from training_provisioner.models.training_course import TrainingCourse
 from training_provisioner.models.enrollment import (
     Enrollment, EnrollmentHistoryEvent)
 from training_provisioner.dao.group import is_admin_user
+import json
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginates changelists by the planner's row estimate where the
+    database provides one, counting exactly only small result sets.
+    """
+    EXACT_COUNT_THRESHOLD = 10000
+
+    @cached_property
+    def count(self):
+        estimate = self.estimated_count()
+        if estimate is None or estimate < self.EXACT_COUNT_THRESHOLD:
+            return super().count
+        return estimate
+
+    def estimated_count(self):
+        connection = connections[self.object_list.db]
+        if connection.vendor != 'postgresql':
+            return None
+
+        sql, params = self.object_list.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+            plan = cursor.fetchone()[0]
+
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return plan[0]['Plan']['Plan Rows']
 
 
 class SAMLAdminSite(admin.AdminSite):
@@ -72,7 +108,40 @@ class SAMLReadOnlyAdminModel(AbstractSAMLReadOnlyAdminModel, admin.ModelAdmin):
     pass
 
 
-class SAMLAdminTrainingCourseModel(SAMLAdminModel):
+class EnrollmentActionsMixin():
+    """
+    Admin actions that requeue or delete the enrollments of the selected
+    objects in batched UPDATEs, rather than one save per enrollment.
+    Bumped enrollments are imported right away, as only default priority
+    imports are scheduled.  Admins using it define
+    selected_enrollments(queryset).
+    """
+    actions = ['reprovision_enrollments', 'delete_enrollments',
+               'bump_enrollments']
+
+    @admin.action(description='Re-provision selected enrollments')
+    def reprovision_enrollments(self, request, queryset):
+        count = Enrollment.objects.requeue(self.selected_enrollments(queryset))
+        self.message_user(request, f"Re-provisioning {count} enrollments")
+
+    @admin.action(description='Mark selected enrollments deleted')
+    def delete_enrollments(self, request, queryset):
+        count = Enrollment.objects.mark_deleted(
+            self.selected_enrollments(queryset))
+        self.message_user(request, f"Marked {count} enrollments deleted")
+
+    @admin.action(description='Bump selected enrollments to immediate')
+    def bump_enrollments(self, request, queryset):
+        count = Enrollment.objects.requeue(
+            self.selected_enrollments(queryset),
+            priority=ImportResource.PRIORITY_IMMEDIATE)
+        call_command('import_training_courses',
+                     str(ImportResource.PRIORITY_IMMEDIATE))
+        self.message_user(
+            request, f"Bumped {count} enrollments to immediate priority")
+
+
+class SAMLAdminTrainingCourseModel(EnrollmentActionsMixin, SAMLAdminModel):
     readonly_fields = ['creation_date', 'deleted_date']
 
     def get_readonly_fields(self, request, obj=None):
@@ -85,13 +154,37 @@ class SAMLAdminTrainingCourseModel(SAMLAdminModel):
 
         return self.readonly_fields + dependent_fields
 
+    def selected_enrollments(self, queryset):
+        return Enrollment.objects.filter(
+            course__training_course__in=queryset.values('pk'))
 
-class SAMLAdminEnrollmentModel(SAMLReadOnlyAdminModel):
+
+class SAMLAdminCourseModel(EnrollmentActionsMixin, SAMLReadOnlyAdminModel):
+    """Read-only admin interface for Course model."""
+    list_display = ['course_id', 'training_course', 'priority',
+                    'provisioned_date', 'deleted_date', 'queue_id']
+    list_filter = ['priority', 'training_course']
+    list_select_related = ['training_course']
+    search_fields = ['course_id__startswith']
+
+    def selected_enrollments(self, queryset):
+        return Enrollment.objects.filter(course__in=queryset.values('pk'))
+
+    def has_view_permission(self, request, obj=None):
+        return is_admin_user(request)
+
+
+class SAMLAdminEnrollmentModel(EnrollmentActionsMixin,
+                               SAMLReadOnlyAdminModel):
     """Read-only admin interface for Enrollment model."""
-    list_display = ['integration_id', 'course', 'section',
+    list_display = ['integration_id', 'course_display', 'section_display',
                     'eligible_terms_display', 'created_date', 'deleted_date']
     list_filter = ['created_date', 'deleted_date', 'course__training_course']
-    search_fields = ['integration_id', 'course__course_id']
+    list_select_related = ['course', 'section']
+    search_fields = ['integration_id__startswith',
+                     'course__course_id__startswith']
+    show_full_result_count = False
+    paginator = EstimatedCountPaginator
     readonly_fields = ['integration_id', 'course', 'section',
                        'eligible_terms', 'created_date', 'deleted_date',
                        'priority']
@@ -103,16 +196,31 @@ class SAMLAdminEnrollmentModel(SAMLReadOnlyAdminModel):
         return 'None'
     eligible_terms_display.short_description = 'Eligible Terms'
 
+    def course_display(self, obj):
+        return obj.course.course_id
+    course_display.short_description = 'Course'
+    course_display.admin_order_field = 'course__course_id'
+
+    def selected_enrollments(self, queryset):
+        return Enrollment.objects.filter(pk__in=queryset.values('pk'))
+
+    def section_display(self, obj):
+        return obj.section.section_id if obj.section else None
+    section_display.short_description = 'Section'
+    section_display.admin_order_field = 'section__section_id'
+
     def has_view_permission(self, request, obj=None):
         return is_admin_user(request)
 
 
 class SAMLAdminEnrollmentHistoryEventModel(SAMLReadOnlyAdminModel):
     """Read-only admin interface for EnrollmentHistoryEvent model."""
-    list_display = ['timestamp', 'enrollment', 'event_type',
+    list_display = ['timestamp', 'enrollment_id', 'event_type',
                     'integration_id', 'course_id', 'eligible_terms_display']
     list_filter = ['event_type', 'timestamp']
-    search_fields = ['integration_id', 'course_id']
+    search_fields = ['integration_id__startswith', 'course_id__startswith']
+    show_full_result_count = False
+    paginator = EstimatedCountPaginator
     readonly_fields = ['enrollment', 'event_type', 'integration_id',
                        'course_id', 'section_id', 'eligible_terms',
                        'previous_eligible_terms', 'timestamp']
@@ -129,9 +237,22 @@ class SAMLAdminEnrollmentHistoryEventModel(SAMLReadOnlyAdminModel):
         return is_admin_user(request)
 
 
+class SAMLAdminImportMessageModel(SAMLReadOnlyAdminModel):
+    """Read-only admin interface for ImportMessage model."""
+    list_display = ['queue', 'message_type', 'message_class', 'csv_file',
+                    'row', 'course_id', 'integration_id']
+    list_filter = ['message_type', 'message_class', 'csv_file']
+    search_fields = ['course_id', 'integration_id']
+
+    def has_view_permission(self, request, obj=None):
+        return is_admin_user(request)
+
+
 admin_site = SAMLAdminSite(name='SAMLAdmin')
 admin_site.register(TrainingCourse, SAMLAdminTrainingCourseModel)
 admin_site.register(Import, SAMLReadOnlyAdminModel)
+admin_site.register(Course, SAMLAdminCourseModel)
 admin_site.register(Enrollment, SAMLAdminEnrollmentModel)
 admin_site.register(EnrollmentHistoryEvent,
                     SAMLAdminEnrollmentHistoryEventModel)
+admin_site.register(ImportMessage, SAMLAdminImportMessageModel)
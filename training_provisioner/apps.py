@@ -13,3 +13,5 @@ class TrainingProvisionerConfig(AppConfig):
         mock_training_data = os.path.join(
             os.path.dirname(__file__), "resources")
         MockDAO.register_mock_path(mock_training_data)
+
+        import training_provisioner.signals  # noqa: F401
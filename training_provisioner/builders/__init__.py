@@ -9,8 +9,8 @@ from logging import getLogger
 
 
 class Builder(object):
-    def __init__(self, items=[]):
-        self.data = Collector()
+    def __init__(self, items=[], max_rows=None, max_bytes=None):
+        self.data = Collector(max_rows=max_rows, max_bytes=max_bytes)
         self.queue_id = None
         self.invalid_users = {}
         self.items = items
@@ -25,8 +25,13 @@ class Builder(object):
     def _write(self):
         return self.data.write_files()
 
+    def _write_shard(self):
+        return
+
     def build(self, **kwargs):
         self._init_build(**kwargs)
         for item in self.items:
             self._process(item)
+            if self.data.is_full():
+                self._write_shard()
         return self._write()
@@ -2,47 +2,152 @@
 # SPDX-License-Identifier: Apache-2.0
 
 
+from training_provisioner.models import Import, resources_updated
+from training_provisioner.models.course import Course
 from training_provisioner.models.section import Section
 from training_provisioner.models.enrollment import Enrollment
 from training_provisioner.builders import Builder
 from training_provisioner.csv.format import (
     CourseCSV, SectionCSV, EnrollmentCSV)
+from django.db.models import Q
+from itertools import groupby
+from operator import attrgetter
+
+
+class CourseRows(object):
+    """
+    Streams rows ordered by course, handing out each course's rows as
+    courses are processed in ascending pk order.
+
+    Rows are read a keyset page of chunk_size at a time, and each page is
+    fetched in full, so no cursor is left open while _write_shard moves
+    rows to a shard import.
+    """
+    def __init__(self, queryset, chunk_size):
+        self._groups = groupby(self._pages(queryset, chunk_size),
+                               key=attrgetter('course_id'))
+        self._next_group()
+
+    def _pages(self, queryset, chunk_size):
+        queryset = queryset.order_by('course_id', 'pk')
+        page = list(queryset[:chunk_size])
+        while len(page):
+            yield from page
+            if len(page) < chunk_size:
+                return
+
+            last = page[-1]
+            page = list(queryset.filter(
+                Q(course_id__gt=last.course_id) |
+                Q(course_id=last.course_id, pk__gt=last.pk))[:chunk_size])
+
+    def _next_group(self):
+        self.course_id, self.rows = next(self._groups, (None, iter(())))
+
+    def for_course(self, course):
+        while self.course_id is not None and self.course_id < course.pk:
+            self._next_group()
+
+        return self.rows if self.course_id == course.pk else iter(())
 
 
 class CourseBuilder(Builder):
     """
     Generates import data for Course and Enrollment models.
+
+    When the collector is bounded by max_rows or max_bytes, the build is
+    cut into shards at course boundaries. Each shard is moved to its own
+    Import and passed to on_shard as soon as its csv files are written.
+
+    Sections and enrollments for every course are claimed with one UPDATE
+    per table, then read in course order CHUNK_SIZE rows per query, so the
+    number of queries does not grow with the number of courses.
     """
+    CHUNK_SIZE = 2000
+
+    def __init__(self, items=[], on_shard=None, **kwargs):
+        super(CourseBuilder, self).__init__(items, **kwargs)
+        self.on_shard = on_shard
+        self.shard_courses = []
+
+    def _init_build(self, **kwargs):
+        self.items = sorted(self.items, key=attrgetter('pk'))
+        if len(self.items):
+            self.queue_id = self.items[0].queue_id
+
+        self.sections = CourseRows(self._course_imports(
+            Section.objects).select_related('course'), self.CHUNK_SIZE)
+        self.enrollments = CourseRows(self._course_imports(
+            Enrollment.objects).select_related(
+                'course', 'section', 'course__training_course'),
+            self.CHUNK_SIZE)
+
+    def _course_imports(self, manager):
+        # items queued for an import are all of the import's courses
+        if self.queue_id is None:
+            return manager.course_imports(self.items)
+
+        return manager.queue_course_imports(self.queue_id)
+
     def _process(self, course):
-        if course.queue_id is not None:
-            self.queue_id = course.queue_id
+        self.shard_courses.append(course.pk)
 
         if course.provisioned_date is None:
             course_data = self._course_data(course)
             if not self.data.add(CourseCSV(**course_data)):
                 return
 
-        for section in Section.objects.course_imports(course):
+        for section in self.sections.for_course(course):
             if section.provisioned_date is None:
                 section_data = self._section_data(section)
                 if not self.data.add(SectionCSV(**section_data)):
                     return
 
-        for enrollment in Enrollment.objects.course_imports(course):
+        for enrollment in self.enrollments.for_course(course):
             if enrollment.provisioned_date is None:
                 enrollment_data = self._enrollment_data(enrollment)
                 self.data.add(EnrollmentCSV(**enrollment_data))
 
+    def _write_shard(self):
+        if self.queue_id is None or not len(self.shard_courses):
+            return
+
+        queued = Import.objects.get(pk=self.queue_id)
+        shard = Import.objects.create(
+            csv_type=queued.csv_type, priority=queued.priority,
+            override_sis_stickiness=queued.override_sis_stickiness)
+
+        Course.objects.filter(
+            pk__in=self.shard_courses, queue_id=self.queue_id
+        ).update(queue_id=shard.pk)
+        Section.objects.filter(
+            course__in=self.shard_courses, queue_id=self.queue_id
+        ).update(queue_id=shard.pk)
+        Enrollment.objects.filter(
+            course__in=self.shard_courses, queue_id=self.queue_id
+        ).update(queue_id=shard.pk)
+        resources_updated.send(sender=Course)
+
+        self.shard_courses = []
+        shard.csv_path = self._write()
+        shard.save()
+
+        self.logger.info(f"import {self.queue_id} shard {shard.pk}: "
+                         f"{shard.csv_path}")
+
+        if self.on_shard:
+            self.on_shard(shard)
+
     def _course_data(self, course):
+        training_course = course.training_course
         return {
             'course_id': course.course_id,
-            'short_name': course.training_course.course_name,
-            'long_name': course.training_course.course_name,
-            'blueprint_course_id':
-                course.training_course.blueprint_course_id,
-            'term_id': course.training_course.term_id,
-            'account_id': course.training_course.account_id,
-            'status': course.status
+            'short_name': training_course.course_name,
+            'long_name': training_course.course_name,
+            'blueprint_course_id': training_course.blueprint_course_id,
+            'term_id': training_course.term_id,
+            'account_id': training_course.account_id,
+            'status': training_course.course_status_name
         }
 
     def _section_data(self, section):
@@ -16,7 +16,9 @@ logger = getLogger(__name__)
 
 
 class Collector(object):
-    def __init__(self):
+    def __init__(self, max_rows=None, max_bytes=None):
+        self.max_rows = max_rows
+        self.max_bytes = max_bytes
         self._init_data()
 
     def _init_data(self):
@@ -34,6 +36,8 @@ class Collector(object):
             'sections': SectionHeader(),
             'enrollments': EnrollmentHeader(),
         }
+        self.row_count = 0
+        self.byte_count = 0
 
     def add(self, formatter):
         """
@@ -41,19 +45,26 @@ class Collector(object):
         the formatter is added, False otherwise.
         """
         if isinstance(formatter, UserCSV):
-            return self._add_user(formatter)
+            added = self._add_user(formatter)
         elif isinstance(formatter, EnrollmentCSV):
-            return self._add_enrollment(formatter)
+            added = self._add_enrollment(formatter)
         elif isinstance(formatter, AdminCSV):
-            return self._add_admin(formatter)
+            added = self._add_admin(formatter)
         elif isinstance(formatter, CourseCSV):
-            return self._add_course(formatter)
+            added = self._add_course(formatter)
         elif isinstance(formatter, SectionCSV):
-            return self._add_section(formatter)
+            added = self._add_section(formatter)
         else:
             raise TypeError(
                 'Unknown CSVFormat class: {}'.format(type(formatter)))
 
+        if added:
+            self.row_count += 1
+            if self.max_bytes is not None:
+                self.byte_count += len(str(formatter).encode('utf-8'))
+
+        return added
+
     def _add_admin(self, formatter):
         self.admins.append(formatter)
         return True
@@ -92,6 +103,16 @@ class Collector(object):
                 return True
         return False
 
+    def is_full(self):
+        """
+        Returns True if the collected rows have reached the configured
+        max_rows or max_bytes limit, False otherwise.
+        """
+        return ((self.max_rows is not None and
+                 self.row_count >= self.max_rows) or
+                (self.max_bytes is not None and
+                 self.byte_count >= self.max_bytes))
+
     def write_files(self):
         """
         Writes all csv files. Returns a path to the csv files, or None
@@ -3,29 +3,176 @@
 
 from django.core.files.storage import default_storage
 from django.conf import settings
+from uw_canvas import MissingAccountID
 from uw_canvas.courses import Courses
 from uw_canvas.accounts import Accounts
-from uw_canvas.sis_import import SISImport, CSV_FILES
-from uw_canvas.models import SISImport as SISImportModel
+from uw_canvas.sis_import import SISImport, SIS_IMPORTS_API, CSV_FILES
+from uw_canvas.models import (
+    SISImport as SISImportModel, SISImportError as SISImportErrorModel)
+from restclients_core.dao import LiveDAO
+from threading import Lock, local
 from logging import getLogger
 from io import BytesIO
 import zipfile
-import json
+import time
 
 
 logger = getLogger(__name__)
 
 
+class CanvasRateLimit(object):
+    """
+    Tracks the Canvas rate limit budget reported by the
+    X-Rate-Limit-Remaining and X-Request-Cost response headers, shared by
+    all threads in the process.  The budget is a bucket that Canvas refills
+    at refill_rate units per second; once it is estimated to be below
+    threshold, callers are delayed until it has refilled, each reserving
+    the cost of the last request so that concurrent callers are spaced out.
+    """
+    def __init__(self, threshold=100, refill_rate=10, max_delay=10):
+        self.threshold = float(threshold)
+        self.refill_rate = float(refill_rate)
+        self.max_delay = float(max_delay)
+        self.remaining = None
+        self.cost = 0.0
+        self.updated = time.monotonic()
+        self._lock = Lock()
+
+    def _estimate(self, now):
+        return self.remaining + (now - self.updated) * self.refill_rate
+
+    def delay(self):
+        """
+        Returns the number of seconds the caller should wait before
+        making a request.
+        """
+        with self._lock:
+            if self.remaining is None:
+                return 0
+
+            now = time.monotonic()
+            remaining = self._estimate(now)
+            delay = 0
+            if remaining < self.threshold:
+                delay = min((self.threshold - remaining) / self.refill_rate,
+                            self.max_delay)
+
+            self.remaining = remaining + (
+                delay * self.refill_rate) - self.cost
+            self.updated = now + delay
+            return delay
+
+    def throttle(self):
+        delay = self.delay()
+        if delay > 0:
+            logger.info(f"Canvas rate limit: waiting {delay:.2f}s")
+            time.sleep(delay)
+
+    def update(self, remaining, cost=None):
+        with self._lock:
+            self.remaining = float(remaining)
+            self.updated = time.monotonic()
+            if cost is not None:
+                self.cost = float(cost)
+
+
+canvas_rate_limit = CanvasRateLimit(
+    threshold=getattr(settings, 'CANVAS_RATE_LIMIT_THRESHOLD', 100),
+    refill_rate=getattr(settings, 'CANVAS_RATE_LIMIT_REFILL_RATE', 10),
+    max_delay=getattr(settings, 'CANVAS_RATE_LIMIT_MAX_DELAY', 10))
+
+
+def _response_header(response, name):
+    headers = getattr(response, 'headers', None) or {}
+    for header in headers:
+        if header.lower() == name.lower():
+            return headers[header]
+
+
+class RateLimitedLiveDAO(LiveDAO):
+    """
+    Live DAO that throttles Canvas requests against canvas_rate_limit.
+    Registered as RESTCLIENTS_CANVAS_DAO_CLASS, it is only reached for
+    requests that go to Canvas, so cached and mock responses are never
+    throttled.
+    """
+    def load(self, method, url, headers, body):
+        canvas_rate_limit.throttle()
+        response = super(RateLimitedLiveDAO, self).load(
+            method, url, headers, body)
+
+        remaining = _response_header(response, 'X-Rate-Limit-Remaining')
+        if remaining is not None:
+            canvas_rate_limit.update(
+                remaining, _response_header(response, 'X-Request-Cost'))
+
+        return response
+
+
+class PagedSISImport(SISImport):
+    def get_import_error_pages(self, sis_import, per_page=100):
+        """
+        Yields the errors of a Canvas SIS import a page at a time.
+        """
+        if not self._canvas_account_id:
+            raise MissingAccountID()
+
+        url = SIS_IMPORTS_API.format(
+            self._canvas_account_id) + f"/{sis_import.import_id}/errors"
+        data_key = 'sis_import_errors'
+
+        data = self._get_paged_resource(
+            url, params={'per_page': per_page}, data_key=data_key)
+        while True:
+            yield [SISImportErrorModel(data=error)
+                   for error in data.get(data_key, [])]
+
+            if not self.next_page_url:
+                break
+
+            data = self._get_resource_url(
+                self.next_page_url, False, data_key)
+
+
+_clients = local()
+
+
+def canvas_client(client_cls):
+    """
+    Returns the client_cls instance for the configured Canvas account.
+    Clients keep paging state, so each thread gets its own.
+    """
+    key = (client_cls, getattr(
+        settings, 'RESTCLIENTS_CANVAS_ACCOUNT_ID', None))
+
+    clients = getattr(_clients, 'clients', None)
+    if clients is None:
+        clients = _clients.clients = {}
+
+    if key not in clients:
+        clients[key] = client_cls()
+
+    return clients[key]
+
+
 def get_course_by_sis_id(course_sis_id, params={}):
-    return Courses().get_course_by_sis_id(course_sis_id, params)
+    return canvas_client(Courses).get_course_by_sis_id(course_sis_id, params)
 
 
 def publish_course_by_sis_id(course_sis_id):
-    return Courses().publish_course_by_sis_id(course_sis_id)
+    return canvas_client(Courses).publish_course_by_sis_id(course_sis_id)
 
 
 def unpublish_course_by_sis_id(course_sis_id):
-    return Courses().unpublish_course_by_sis_id(course_sis_id)
+    return canvas_client(Courses).unpublish_course_by_sis_id(course_sis_id)
+
+
+def publish_course(course_id):
+    return canvas_client(Courses).publish_course(course_id)
+
+
+def unpublish_course(course_id):
+    return canvas_client(Courses).unpublish_course(course_id)
 
 
 def sis_import_by_path(csv_path, override_sis_stickiness=False):
@@ -47,31 +194,34 @@ def sis_import_by_path(csv_path, override_sis_stickiness=False):
         params['override_sis_stickiness'] = '1'
         params['clear_sis_stickiness'] = '1'
 
-    return SISImport().import_archive(archive, params=params)
+    return canvas_client(PagedSISImport).import_archive(
+        archive, params=params)
 
 
 def get_sis_import_status(import_id):
-    return SISImport().get_import_status(
+    return canvas_client(PagedSISImport).get_import_status(
         SISImportModel(import_id=str(import_id)))
 
 
 def delete_sis_import(import_id):
-    return SISImport().delete_import(SISImportModel(import_id=str(import_id)))
+    return canvas_client(PagedSISImport).delete_import(
+        SISImportModel(import_id=str(import_id)))
 
 
 def get_sis_imports(params={}):
-    return SISImport().get_imports(params)
+    return canvas_client(PagedSISImport).get_imports(params)
 
 
-def get_import_errors(sis_import):
-    return SISImport().get_import_errors(sis_import)
+def get_import_error_pages(sis_import, per_page=100):
+    return canvas_client(PagedSISImport).get_import_error_pages(
+        sis_import, per_page)
 
 
 def get_auth_settings():
-    return Accounts().get_auth_settings(
+    return canvas_client(Accounts).get_auth_settings(
         settings.RESTCLIENTS_CANVAS_ACCOUNT_ID)
 
 
 def update_auth_settings(auth_settings):
-    return Accounts().update_auth_settings(
+    return canvas_client(Accounts).update_auth_settings(
         settings.RESTCLIENTS_CANVAS_ACCOUNT_ID, auth_settings)
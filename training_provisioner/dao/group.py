@@ -8,6 +8,10 @@ from uw_saml.utils import is_member_of_group
 
 def is_admin_user(request):
     """
-    This check is always a SAML-asserted group membership.
+    This check is always a SAML-asserted group membership, decided once
+    per request since admin pages check permissions for every model.
     """
-    return is_member_of_group(request, settings.STUDENTTRAINING_ADMIN_GROUP)
+    if not hasattr(request, '_is_admin_user'):
+        request._is_admin_user = is_member_of_group(
+            request, settings.STUDENTTRAINING_ADMIN_GROUP)
+    return request._is_admin_user
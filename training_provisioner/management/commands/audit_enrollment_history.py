@@ -2,20 +2,45 @@
 # SPDX-License-Identifier: Apache-2.0
 
 from django.core.management.base import BaseCommand
-from django.db.models import Count, Q
+from django.db.models import Count, Exists, OuterRef, Subquery
 from training_provisioner.models.enrollment import (
     Enrollment, EnrollmentHistoryEvent)
 from training_provisioner.models.training_course import TrainingCourse
+from contextlib import nullcontext
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+class AuditProblems():
+    """
+    Counts the enrollments failing an audit check, keeping the first few
+    for display and writing every one to the output file, if any.
+    """
+    SAMPLE_SIZE = 10
+
+    def __init__(self, check):
+        self.check = check
+        self.count = 0
+        self.samples = []
+
+    def add(self, problem, output=None):
+        self.count += 1
+        if len(self.samples) < self.SAMPLE_SIZE:
+            self.samples.append(problem)
+        if output:
+            output.write('{},{},{},{}\n'.format(self.check, *problem))
+
+    def __len__(self):
+        return self.count
+
+
 class Command(BaseCommand):
     help = """
     Audit enrollment history completeness by checking that all enrollments
     have appropriate history events and identifying any inconsistencies.
     """
+    CHUNK_SIZE = 2000
 
     def add_arguments(self, parser):
         parser.add_argument(
@@ -28,10 +53,17 @@ class Command(BaseCommand):
             action='store_true',
             help='Show detailed output including individual problems',
         )
+        parser.add_argument(
+            '--output-file',
+            type=str,
+            help=('Write check,enrollment_id,integration_id,course_id for '
+                  'every problem found to <output_file>'),
+        )
 
     def handle(self, *args, **options):
         training_course_id = options.get('training_course_id')
         verbose = options['verbose']
+        output_file = options.get('output_file')
 
         self.stdout.write("Starting enrollment history audit...")
 
@@ -60,37 +92,42 @@ class Command(BaseCommand):
         self.stdout.write(f"Total enrollments: {total_enrollments}")
         self.stdout.write(f"Total history events: {total_history_events}")
 
-        # Find enrollments without any history
-        enrollments_without_history = []
-        enrollments_with_missing_created = []
-        enrollments_with_inconsistent_state = []
-
-        for enrollment in enrollments_query:
-            history_events = EnrollmentHistoryEvent.objects.filter(
-                enrollment=enrollment).order_by('timestamp')
-
-            if not history_events.exists():
-                enrollments_without_history.append(enrollment)
-                continue
-
-            # Check if first event is CREATED
-            first_event = history_events.first()
-            created_type = EnrollmentHistoryEvent.EVENT_TYPE_CREATED
-            if first_event.event_type != created_type:
-                enrollments_with_missing_created.append(enrollment)
-
-            # Check for state consistency
-            latest_event = history_events.last()
-
-            # Check if deleted status matches history
-            has_deletion_event = history_events.filter(
-                event_type=EnrollmentHistoryEvent.EVENT_TYPE_DELETED
-            ).exists()
-
-            is_currently_deleted = enrollment.deleted_date is not None
-
-            if has_deletion_event != is_currently_deleted:
-                enrollments_with_inconsistent_state.append(enrollment)
+        # Stream every enrollment once, with its history checks
+        # computed by the database
+        events = EnrollmentHistoryEvent.objects.filter(
+            enrollment=OuterRef('pk'))
+        audited = enrollments_query.annotate(
+            has_history=Exists(events),
+            first_event_type=Subquery(events.order_by(
+                'timestamp', 'pk').values('event_type')[:1]),
+            has_deletion_event=Exists(events.filter(
+                event_type=EnrollmentHistoryEvent.EVENT_TYPE_DELETED))
+        ).values_list(
+            'pk', 'integration_id', 'course__course_id', 'deleted_date',
+            'has_history', 'first_event_type', 'has_deletion_event')
+
+        enrollments_without_history = AuditProblems('no_history')
+        enrollments_with_missing_created = AuditProblems('missing_created')
+        enrollments_with_inconsistent_state = AuditProblems(
+            'inconsistent_state')
+
+        with (open(output_file, 'w') if output_file else
+              nullcontext()) as output:
+            for (pk, integration_id, course_id, deleted_date, has_history,
+                    first_event_type, has_deletion_event) in (
+                    audited.iterator(chunk_size=self.CHUNK_SIZE)):
+                problem = (pk, integration_id, course_id)
+                if not has_history:
+                    enrollments_without_history.add(problem, output)
+                    continue
+
+                created_type = EnrollmentHistoryEvent.EVENT_TYPE_CREATED
+                if first_event_type != created_type:
+                    enrollments_with_missing_created.add(problem, output)
+
+                # Check if deleted status matches history
+                if has_deletion_event != (deleted_date is not None):
+                    enrollments_with_inconsistent_state.add(problem, output)
 
         # Report findings
         self.stdout.write("\n" + "="*50)
@@ -103,9 +140,10 @@ class Command(BaseCommand):
                     f"{len(enrollments_without_history)} enrollments "
                     f"have no history events"))
             if verbose:
-                for enrollment in enrollments_without_history[:10]:
-                    self.stdout.write(f"   - {enrollment.integration_id} in "
-                                      f"{enrollment.course.course_id}")
+                for pk, integration_id, course_id in (
+                        enrollments_without_history.samples):
+                    self.stdout.write(f"   - {integration_id} in "
+                                      f"{course_id}")
                 if len(enrollments_without_history) > 10:
                     remaining = len(enrollments_without_history) - 10
                     self.stdout.write(f"   ... and {remaining} more")
@@ -119,9 +157,10 @@ class Command(BaseCommand):
                     f"{len(enrollments_with_missing_created)} enrollments "
                     f"missing CREATED event"))
             if verbose:
-                for enrollment in enrollments_with_missing_created[:10]:
-                    self.stdout.write(f"   - {enrollment.integration_id} in "
-                                      f"{enrollment.course.course_id}")
+                for pk, integration_id, course_id in (
+                        enrollments_with_missing_created.samples):
+                    self.stdout.write(f"   - {integration_id} in "
+                                      f"{course_id}")
         else:
             self.stdout.write(
                 self.style.SUCCESS("✓ All enrollments have CREATED events"))
@@ -132,9 +171,10 @@ class Command(BaseCommand):
                     f"{len(enrollments_with_inconsistent_state)} "
                     f"enrollments have inconsistent deletion state"))
             if verbose:
-                for enrollment in enrollments_with_inconsistent_state[:10]:
-                    self.stdout.write(f"   - {enrollment.integration_id} in "
-                                      f"{enrollment.course.course_id}")
+                for pk, integration_id, course_id in (
+                        enrollments_with_inconsistent_state.samples):
+                    self.stdout.write(f"   - {integration_id} in "
+                                      f"{course_id}")
         else:
             self.stdout.write(
                 self.style.SUCCESS("✓ All enrollments have consistent "
@@ -2,7 +2,8 @@
 # SPDX-License-Identifier: Apache-2.0
 
 from django.core.management.base import BaseCommand, CommandError
-from django.utils import timezone
+from django.db import transaction
+from django.db.models import Exists, OuterRef
 from training_provisioner.models.enrollment import (
     Enrollment, EnrollmentHistoryEvent)
 import logging
@@ -33,11 +34,18 @@ class Command(BaseCommand):
             type=int,
             help='Only backfill history for specific training course ID',
         )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=10000,
+            help='Create history events <batch_size> enrollments at a time',
+        )
 
     def handle(self, *args, **options):
         dry_run = options['dry_run']
         course_id = options.get('course_id')
         training_course_id = options.get('training_course_id')
+        batch_size = options['batch_size']
 
         # Build queryset of enrollments without history
         enrollments_query = Enrollment.objects.all()
@@ -51,13 +59,11 @@ class Command(BaseCommand):
                 course__training_course_id=training_course_id)
 
         # Find enrollments that don't have any history events
-        enrollments_without_history = []
-        for enrollment in enrollments_query:
-            if not EnrollmentHistoryEvent.objects.filter(
-                    enrollment=enrollment).exists():
-                enrollments_without_history.append(enrollment)
+        enrollments_without_history = enrollments_query.filter(~Exists(
+            EnrollmentHistoryEvent.objects.filter(enrollment=OuterRef('pk'))
+        )).order_by('pk')
 
-        count = len(enrollments_without_history)
+        count = enrollments_without_history.count()
 
         if count == 0:
             self.stdout.write(
@@ -74,47 +80,54 @@ class Command(BaseCommand):
                                    f"events for existing enrollments."))
 
             # Show first 10 enrollments
-            for enrollment in enrollments_without_history[:10]:
-                self.stdout.write(f"  - {enrollment.integration_id} in "
-                                  f"{enrollment.course.course_id}")
+            for integration_id, course_id in (
+                    enrollments_without_history.values_list(
+                        'integration_id', 'course__course_id')[:10]):
+                self.stdout.write(f"  - {integration_id} in {course_id}")
 
             if count > 10:
                 self.stdout.write(f"  ... and {count - 10} more")
             return
 
-        # Create history events for enrollments without history
+        # Create CREATED events with each enrollment's current state, in
+        # chunks keyed on pk, timestamped when the enrollment was created
         created_count = 0
-        for enrollment in enrollments_without_history:
+        last_pk = 0
+        while True:
+            chunk = list(enrollments_without_history.filter(
+                pk__gt=last_pk).values_list(
+                    'pk', 'integration_id', 'course__course_id',
+                    'section__section_id', 'eligible_terms', 'created_date'
+                )[:batch_size])
+            if not len(chunk):
+                break
+
+            last_pk = chunk[-1][0]
             try:
-                # Create a CREATED event with the enrollment's current state
-
-                # The model has auto_now_add for created_date, so it will use
-                # the current time when the event is created. If we wanted
-                # to override that, we would need to change the model and use
-                # something like:
-                # timestamp = enrollment.created_date
-
-                EnrollmentHistoryEvent.objects.create(
-                    enrollment=enrollment,
-                    event_type=EnrollmentHistoryEvent.EVENT_TYPE_CREATED,
-                    integration_id=enrollment.integration_id,
-                    course_id=enrollment.course.course_id,
-                    section_id=(enrollment.section.section_id
-                                if enrollment.section else None),
-                    eligible_terms=(enrollment.eligible_terms.copy()
-                                    if enrollment.eligible_terms else []),
-                )
-                created_count += 1
-
-                if created_count % 100 == 0:
-                    self.stdout.write(f"Processed {created_count}/{count}...")
+                with transaction.atomic():
+                    created_count += len(
+                        EnrollmentHistoryEvent.objects.bulk_create([
+                            EnrollmentHistoryEvent(
+                                enrollment_id=pk,
+                                event_type=(
+                                    EnrollmentHistoryEvent.EVENT_TYPE_CREATED),
+                                integration_id=integration_id,
+                                course_id=course_id,
+                                section_id=section_id,
+                                eligible_terms=eligible_terms or [],
+                                timestamp=created_date)
+                            for (pk, integration_id, course_id, section_id,
+                                 eligible_terms, created_date) in chunk],
+                            batch_size=EnrollmentHistoryEvent.BATCH_SIZE))
+
+                self.stdout.write(f"Processed {created_count}/{count}...")
 
             except Exception as e:
-                logger.error(f"Failed to create history for enrollment "
-                             f"{enrollment.id}: {e}")
+                logger.error(f"Failed to create history for enrollments "
+                             f"{chunk[0][0]} to {last_pk}: {e}")
                 self.stdout.write(
-                    self.style.ERROR(f"Error processing enrollment "
-                                     f"{enrollment.integration_id}: {e}"))
+                    self.style.ERROR(f"Error processing enrollments "
+                                     f"{chunk[0][0]} to {last_pk}: {e}"))
 
         self.stdout.write(
             self.style.SUCCESS(
@@ -1,13 +1,27 @@
 # Copyright 2026 UW-IT, University of Washington
 # SPDX-License-Identifier: Apache-2.0
 
+from django.conf import settings
 from django.core.management.base import BaseCommand
+from django.db import connections
 from training_provisioner.models.course import Course
 from training_provisioner.exceptions import (
     EmptyQueueException, MissingImportPathException)
 from training_provisioner.builders.courses import CourseBuilder
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from logging import getLogger
+import multiprocessing
 import traceback
 
+logger = getLogger(__name__)
+
+
+def import_partition(priority, partition, options):
+    try:
+        Command().import_courses(priority, partition, options)
+    finally:
+        connections.close_all()
+
 
 class Command(BaseCommand):
     help = "Builds csv for training Courses"
@@ -18,22 +32,74 @@ class Command(BaseCommand):
             choices=[Course.PRIORITY_DEFAULT,
                      Course.PRIORITY_IMMEDIATE],
             help='Import courses with priority <priority>')
+        parser.add_argument(
+            '--max-rows', type=int, dest='max_rows',
+            default=getattr(settings, 'TRAINING_IMPORT_MAX_ROWS', None),
+            help='Cut the import into shards of at most <max_rows> rows')
+        parser.add_argument(
+            '--max-bytes', type=int, dest='max_bytes',
+            default=getattr(settings, 'TRAINING_IMPORT_MAX_BYTES', None),
+            help='Cut the import into shards of at most <max_bytes> bytes')
+        parser.add_argument(
+            '--workers', type=int, dest='workers', default=1,
+            help='Partition queued courses across <workers> processes')
 
     def handle(self, *args, **options):
         priority = options.get('priority')
+        workers = options.get('workers')
+        if workers <= 1:
+            return self.import_courses(priority, None, options)
+
+        # forked workers must not share the parent's connections
+        connections.close_all()
+
+        with ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context('fork')) as pool:
+            limits = {'max_rows': options.get('max_rows'),
+                      'max_bytes': options.get('max_bytes')}
+            futures = [pool.submit(
+                import_partition, priority, (index, workers), limits)
+                for index in range(workers)]
+
+            for index, future in enumerate(futures):
+                try:
+                    future.result()
+                except Exception as ex:
+                    logger.error(f"import worker {index} failed: {ex}")
+
+    def import_courses(self, priority, partition, options):
         try:
-            imp = Course.objects.queue_by_priority(priority)
+            imp = Course.objects.queue_by_priority(priority, partition)
         except EmptyQueueException as ex:
             return
 
-        try:
-            builder = CourseBuilder(imp.queued_objects())
-            imp.csv_path = builder.build()
-        except Exception:
-            imp.csv_errors = traceback.format_exc()
+        # shards upload in sequence while the next shard is built
+        with ThreadPoolExecutor(max_workers=1) as uploader:
+            try:
+                builder = CourseBuilder(
+                    imp.queued_objects(),
+                    max_rows=options.get('max_rows'),
+                    max_bytes=options.get('max_bytes'),
+                    on_shard=lambda shard: uploader.submit(
+                        self.import_shard, shard))
+                imp.csv_path = builder.build()
+            except Exception:
+                imp.csv_errors = traceback.format_exc()
 
-        imp.save()
+            imp.save()
+
+        self.import_csv(imp)
+
+    def import_shard(self, imp):
+        try:
+            self.import_csv(imp)
+        except Exception as ex:
+            logger.error(f"shard import {imp.pk} failed: {ex}")
+        finally:
+            connections.close_all()
 
+    def import_csv(self, imp):
         try:
             imp.import_csv()
         except MissingImportPathException as ex:
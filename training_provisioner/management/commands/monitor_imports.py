@@ -2,8 +2,12 @@
 # SPDX-License-Identifier: Apache-2.0
 
 
+from django.conf import settings
 from django.core.management.base import BaseCommand, CommandError
 from training_provisioner.models import Import
+from restclients_core.exceptions import DataFailureException
+from concurrent.futures import (
+    ThreadPoolExecutor, as_completed, TimeoutError)
 from logging import getLogger
 
 logger = getLogger(__name__)
@@ -12,10 +16,51 @@ logger = getLogger(__name__)
 class Command(BaseCommand):
     help = "Monitors Canvas Training Course import status."
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers', type=int, dest='workers',
+            default=getattr(settings, 'MONITOR_IMPORTS_WORKERS', 10),
+            help='Poll at most <workers> imports concurrently')
+        parser.add_argument(
+            '--timeout', type=float, dest='timeout',
+            default=getattr(settings, 'MONITOR_IMPORTS_TIMEOUT', 60),
+            help='Stop waiting for import status after <timeout> seconds')
+
     def handle(self, *args, **options):
         try:
-            for imp in Import.objects.find_by_requires_update():
-                imp.update_import_status()
+            self.monitor_imports(options.get('workers'),
+                                 options.get('timeout'))
         except Exception as err:
             logger.error("{}".format(err))
             raise CommandError(err)
+
+    def monitor_imports(self, workers, timeout):
+        """
+        Fetches import status from Canvas in a pool of threads, applying
+        each result to its import as it arrives.
+        """
+        imports = list(Import.objects.find_by_requires_update())
+        if not len(imports):
+            return
+
+        pool = ThreadPoolExecutor(max_workers=max(1, workers))
+        try:
+            futures = {pool.submit(imp.fetch_import_status): imp
+                       for imp in imports}
+
+            for future in as_completed(futures, timeout=timeout):
+                imp = futures[future]
+                try:
+                    sis_import = future.result()
+                except (DataFailureException, KeyError) as ex:
+                    logger.info('Monitor error: {}'.format(ex))
+                    imp.defer_monitor()
+                    continue
+
+                imp.update_import_status(sis_import)
+        except TimeoutError:
+            pending = [imp.pk for future, imp in futures.items()
+                       if not future.done()]
+            logger.info(f"Monitor timeout, imports pending: {pending}")
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
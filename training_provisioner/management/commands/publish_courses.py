@@ -2,14 +2,19 @@
 # SPDX-License-Identifier: Apache-2.0
 
 from django.core.management.base import BaseCommand, CommandError
+from django.utils.timezone import localtime
 from training_provisioner.models.training_course import TrainingCourse
 from training_provisioner.models.course import Course
-from training_provisioner.dao.canvas import (unpublish_course_by_sis_id,
-                                             publish_course_by_sis_id)
+from training_provisioner.dao.canvas import (
+    get_course_by_sis_id, publish_course, unpublish_course)
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from logging import getLogger
 
 logger = getLogger(__name__)
 
+PUBLISHED = 'available'
+UNPUBLISHED = 'unpublished'
+
 
 class Command(BaseCommand):
     help = "Publish or unpublish Canvas courses associated with the specified "
@@ -34,12 +39,27 @@ class Command(BaseCommand):
             action='store_true',
             help='Unpublish the courses instead of publishing them'
         )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=1,
+            help='Publish or unpublish up to <workers> courses concurrently'
+        )
+        parser.add_argument(
+            '--resume',
+            action='store_true',
+            help='Skip courses already published or unpublished by a'
+            ' previous run'
+        )
 
     def handle(self, *args, **options):
         training_course_blueprint_sis_id = options[
-            'training-course-blueprint-sis-id']
+            'training_course_blueprint_sis_id']
         dry_run = options.get('dry_run', False)
         unpublish = options.get('unpublish', False)
+        workers = max(1, options.get('workers') or 1)
+        resume = options.get('resume', False)
+        target_status = UNPUBLISHED if unpublish else PUBLISHED
 
         try:
             # Get the training course
@@ -63,48 +83,74 @@ class Command(BaseCommand):
                               f"{'unpublish' if unpublish else 'publish'}")
 
             modified_courses_count = 0
+            skipped_count = 0
             failed_count = 0
+            action_taken = 'unpublish' if unpublish else 'publish'
 
-            for course in courses:
-                course_sis_id = course.course_id
-                action_taken = 'unpublish' if unpublish else 'publish'
+            if resume and not dry_run:
+                skipped_count = courses.filter(
+                    published_status=target_status).count()
+                courses = courses.exclude(published_status=target_status)
+                self.stdout.write(f"Resuming, skipping {skipped_count} "
+                                  f"courses already {action_taken}ed")
 
-                if dry_run:
+            if dry_run:
+                for course in courses:
                     self.stdout.write(f"Would {action_taken} course:"
-                                      f" {course_sis_id}")
-                    continue
-
-                try:
-                    if unpublish:
-                        self.stdout.write("Unpublishing course: "
-                                          f"{course_sis_id}")
-                        result = unpublish_course_by_sis_id(course_sis_id)
-                    else:
-                        self.stdout.write("Publishing course: "
-                                          f"{course_sis_id}")
-                        result = publish_course_by_sis_id(course_sis_id)
-
-                    if result:
-                        modified_courses_count += 1
-                        self.stdout.write(
-                            self.style.SUCCESS(f"Successfully {action_taken}ed"
-                                               f" {course_sis_id}"))
-                        logger.info(f"Successfully {action_taken}ed course "
-                                    f"{course_sis_id}")
-                    else:
-                        failed_count += 1
+                                      f" {course.course_id}")
+
+            else:
+                # Canvas requests run in the pool, results are recorded
+                # here as they complete
+                with ThreadPoolExecutor(max_workers=workers) as pool:
+                    futures = {}
+                    for course in courses:
                         self.stdout.write(
-                            self.style.ERROR(f"Failed to {action_taken} "
-                                             f"{course_sis_id}"))
-                        logger.error(f"Failed to {action_taken} course"
-                                     f" {course_sis_id}")
-
-                except Exception as err:
-                    failed_count += 1
-                    error_msg = f"Error {action_taken}ing course "
-                    error_msg += f"{course_sis_id}: {err}"
-                    self.stdout.write(self.style.ERROR(f"{error_msg}"))
-                    logger.error(error_msg)
+                            f"{action_taken.capitalize()}ing course: "
+                            f"{course.course_id}")
+                        futures[pool.submit(
+                            self.update_course, course.course_id,
+                            target_status)] = course
+
+                    for future in as_completed(futures):
+                        course_sis_id = futures[future].course_id
+                        try:
+                            result, modified = future.result()
+                        except Exception as err:
+                            failed_count += 1
+                            error_msg = f"Error {action_taken}ing course "
+                            error_msg += f"{course_sis_id}: {err}"
+                            self.stdout.write(self.style.ERROR(
+                                f"{error_msg}"))
+                            logger.error(error_msg)
+                            continue
+
+                        if result:
+                            Course.objects.filter(
+                                pk=futures[future].pk).update(
+                                    published_date=localtime(),
+                                    published_status=result.workflow_state)
+
+                        if result and not modified:
+                            skipped_count += 1
+                            self.stdout.write(
+                                f"Course {course_sis_id} already "
+                                f"{action_taken}ed")
+                        elif result:
+                            modified_courses_count += 1
+                            self.stdout.write(
+                                self.style.SUCCESS(
+                                    f"Successfully {action_taken}ed"
+                                    f" {course_sis_id}"))
+                            logger.info(f"Successfully {action_taken}ed "
+                                        f"course {course_sis_id}")
+                        else:
+                            failed_count += 1
+                            self.stdout.write(
+                                self.style.ERROR(f"Failed to {action_taken} "
+                                                 f"{course_sis_id}"))
+                            logger.error(f"Failed to {action_taken} course"
+                                         f" {course_sis_id}")
 
             if dry_run:
                 self.stdout.write(
@@ -117,6 +163,7 @@ class Command(BaseCommand):
                         f"{'Unpublish' if unpublish else 'Publish'} operation "
                         "complete. "
                         f"Success: {modified_courses_count}, "
+                        f"Skipped: {skipped_count}, "
                         f"Failed: {failed_count}"))
 
         except TrainingCourse.DoesNotExist:
@@ -131,3 +178,17 @@ class Command(BaseCommand):
             self.stdout.write(self.style.ERROR(error_msg))
             logger.error(error_msg)
             raise CommandError(error_msg)
+
+    def update_course(self, course_sis_id, target_status):
+        """
+        Moves the Canvas course to target_status, unless it is there
+        already.  Returns the Canvas course and whether it was modified.
+        """
+        course = get_course_by_sis_id(course_sis_id)
+        if course is None or course.workflow_state == target_status:
+            return course, False
+
+        if target_status == UNPUBLISHED:
+            return unpublish_course(course.course_id), True
+
+        return publish_course(course.course_id), True
@@ -2,12 +2,15 @@
 # SPDX-License-Identifier: Apache-2.0
 
 from django.core.management.base import BaseCommand
+from django.db.models import Exists, OuterRef
+from training_provisioner.models import Import, resources_updated
 from training_provisioner.models.course import Course
 from training_provisioner.models.enrollment import Enrollment
-from training_provisioner.dao.canvas import get_sis_imports, get_import_errors
+from training_provisioner.models.import_message import ImportMessage
+from training_provisioner.dao.canvas import (
+    get_sis_imports, get_sis_import_status, get_import_error_pages)
+from restclients_core.exceptions import DataFailureException
 from datetime import datetime, timedelta, timezone
-import json
-import re
 from logging import getLogger
 
 
@@ -33,50 +36,54 @@ class Command(BaseCommand):
             self.process_enrollment_errors(latest_import)
 
     def process_enrollment_errors(self, sis_import):
-        for sis_error in get_import_errors(sis_import):
-            if sis_error.import_file == 'enrollments.csv':
-                if sis_error.message.startswith(
-                        'User not found for enrollment'):
-                    self.prioritize_enrollment(sis_error)
-
-    def prioritize_enrollment(self, sis_error):
-        try:
-            row = self.get_csv_row(sis_error.row_info)
-            integration_id = row['user_integration_id']
-            course_id = row['course_id']
-
-            course = Course.objects.get(course_id=course_id)
-            enrollment = Enrollment.objects.get(
-                integration_id=integration_id,
-                course__course_id=course_id)
-
-            # Mark enrollment's course to trigger import
-            if course.priority == Course.PRIORITY_NONE:
-                course.priority = Course.PRIORITY_DEFAULT
-                course.save()
-                logger.info(f"update course {course_id} priority")
-
-            # Reset enrollment to unprovisioned state
-            enrollment.provisioned_date = None
-            enrollment.priority = Enrollment.PRIORITY_DEFAULT
-            enrollment.save()
-            logger.info(f"Prioritize enrollment {integration_id} in "
-                        f"course {course_id}")
-
-        except Exception as ex:
-            logger.error(f"Malformed row ({ex}): {sis_error.row_info}")
-        except Course.DoesNotExist:
-            logger.error(f"Missing Course ({course_id}) for {integration_id}")
-        except Enrollment.DoesNotExist:
-            logger.error(f"Missing Enrollment for {integration_id} in "
-                         f"course {course_id}")
-
-    def get_csv_row(self, row_info):
-        # map hokey ruby string to json
-        json_row = re.sub(
-            r'([{ ])([A-Za-z_]+):', '\\1"\\2":', row_info)
-        json_row = re.sub(r' nil([,}])', ' null\\1', json_row)
-        return json.loads(json_row)[0]
+        canvas_id = str(sis_import.import_id)
+
+        # the Import may have been removed since Canvas ran it
+        imp = Import.objects.filter(canvas_id=canvas_id).first()
+
+        ImportMessage.objects.import_errors(canvas_id).delete()
+        for sis_errors in get_import_error_pages(sis_import):
+            ImportMessage.objects.add_import_errors(imp, sis_errors)
+
+        self.prioritize_enrollments(canvas_id)
+
+        if imp is None:
+            ImportMessage.objects.import_errors(canvas_id).delete()
+
+    def prioritize_enrollments(self, canvas_id):
+        """
+        Resets the enrollments Canvas could not find users for in the
+        import to their unprovisioned state and marks their courses for
+        import.
+        """
+        not_found = ImportMessage.objects.users_not_found(canvas_id)
+        matching = Exists(not_found.filter(
+            course_id=OuterRef('course__course_id'),
+            integration_id=OuterRef('integration_id')))
+
+        for row, course_id, integration_id in not_found.filter(~Exists(
+                Enrollment.objects.filter(
+                    course__course_id=OuterRef('course_id'),
+                    integration_id=OuterRef('integration_id')))
+        ).values_list('row', 'course_id', 'integration_id'):
+            if integration_id is None:
+                logger.error(f"Malformed row {row} in import {canvas_id}")
+            else:
+                logger.error(f"Missing Enrollment for {integration_id} in "
+                             f"course {course_id}")
+
+        # Reset enrollments to unprovisioned state
+        count = Enrollment.objects.filter(matching).update(
+            provisioned_date=None, priority=Enrollment.PRIORITY_DEFAULT)
+        logger.info(f"Prioritize {count} enrollments")
+
+        # Mark enrollments' courses to trigger import
+        count = Course.objects.filter(
+            priority=Course.PRIORITY_NONE,
+            pk__in=Enrollment.objects.filter(matching).values('course_id')
+        ).update(priority=Course.PRIORITY_DEFAULT)
+        logger.info(f"update {count} course priorities")
+        resources_updated.send(sender=Enrollment)
 
     def get_most_recent_import(self, params={}):
         # disregard imports older than 3 days
@@ -94,8 +101,8 @@ class Command(BaseCommand):
         return most_recent
 
     def get_import_by_id(self, import_id):
-        for imp in get_sis_imports():
-            if import_id == imp.import_id:
-                return imp
-
-        return None
+        try:
+            return get_sis_import_status(import_id)
+        except DataFailureException as ex:
+            logger.error(f"SIS import {import_id}: {ex}")
+            return None
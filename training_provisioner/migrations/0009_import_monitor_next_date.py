@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-19 01:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('training_provisioner', '0008_alter_enrollmenthistoryevent_event_type'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='import',
+            name='monitor_next_date',
+            field=models.DateTimeField(null=True),
+        ),
+        migrations.AddField(
+            model_name='import',
+            name='monitor_progress_rate',
+            field=models.FloatField(null=True),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-19 01:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('training_provisioner', '0009_import_monitor_next_date'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='course',
+            name='published_date',
+            field=models.DateTimeField(null=True),
+        ),
+        migrations.AddField(
+            model_name='course',
+            name='published_status',
+            field=models.CharField(max_length=20, null=True),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-19 01:27
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('training_provisioner', '0010_course_published_status'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImportMessage',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('message_type', models.SlugField(choices=[('warning', 'Warning'), ('error', 'Error')], max_length=20)),
+                ('message_class', models.SlugField(choices=[('user_not_found', 'User not found'), ('course_not_found', 'Course not found')], max_length=40, null=True)),
+                ('csv_file', models.CharField(max_length=40)),
+                ('row', models.IntegerField(null=True)),
+                ('course_id', models.CharField(max_length=80, null=True)),
+                ('section_id', models.CharField(max_length=80, null=True)),
+                ('integration_id', models.CharField(max_length=32, null=True)),
+                ('message', models.TextField()),
+                ('queue', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='messages', to='training_provisioner.import')),
+            ],
+            options={
+                'db_table': 'import_message',
+                'indexes': [models.Index(fields=['queue', 'csv_file'], name='import_mess_queue_i_c457f1_idx'), models.Index(fields=['message_class', 'course_id'], name='import_mess_message_a8a10c_idx'), models.Index(fields=['integration_id'], name='import_mess_integra_7f5988_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.18 on 2026-10-19 01:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('training_provisioner', '0011_importmessage'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='course',
+            index=models.Index(condition=models.Q(('provisioned_error__isnull', True), ('queue_id__isnull', True)), fields=['priority'], name='course_queue_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='course',
+            index=models.Index(condition=models.Q(('queue_id__isnull', False)), fields=['queue_id'], name='course_queued_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='enrollment',
+            index=models.Index(condition=models.Q(('queue_id__isnull', True)), fields=['course', 'priority'], name='enrollment_import_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='enrollment',
+            index=models.Index(condition=models.Q(('queue_id__isnull', False)), fields=['queue_id'], name='enrollment_queued_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='enrollment',
+            index=models.Index(condition=models.Q(('deleted_date__isnull', True)), fields=['integration_id', 'course'], name='enrollment_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='import',
+            index=models.Index(condition=models.Q(('canvas_id__isnull', False), ('post_status', 200)), fields=['monitor_next_date'], name='import_monitor_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='section',
+            index=models.Index(condition=models.Q(('queue_id__isnull', True)), fields=['course', 'priority'], name='section_import_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='section',
+            index=models.Index(condition=models.Q(('queue_id__isnull', False)), fields=['queue_id'], name='section_queued_idx'),
+        ),
+    ]
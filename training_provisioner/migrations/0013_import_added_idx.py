@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-19 01:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('training_provisioner', '0012_queue_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='import',
+            index=models.Index(fields=['added_date', 'id'], name='import_added_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-19 01:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('training_provisioner', '0013_import_added_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='enrollmenthistoryevent',
+            index=models.Index(fields=['course_id'], name='history_course_id_like_idx', opclasses=['varchar_pattern_ops']),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 01:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('training_provisioner', '0014_history_course_id_like_idx'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='enrollmenthistoryevent',
+            name='event_type',
+            field=models.CharField(choices=[('created', 'Enrollment Created'), ('updated', 'Enrollment Updated'), ('deleted', 'Enrollment Deleted'), ('moved', 'Enrollment Moved'), ('reactivated', 'Enrollment Reactivated'), ('requeued', 'Enrollment Requeued')], db_index=True, max_length=20),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-19 01:48
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('training_provisioner', '0015_enrollmenthistoryevent_requeued'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='enrollmenthistoryevent',
+            name='timestamp',
+            field=models.DateTimeField(db_index=True, default=django.utils.timezone.now, editable=False),
+        ),
+    ]
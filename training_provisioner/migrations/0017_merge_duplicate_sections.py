@@ -0,0 +1,68 @@
+# Generated by Django 5.2.18 on 2026-10-19 01:50
+
+from django.db import migrations
+from django.db.models import Count, Min
+from logging import getLogger
+
+logger = getLogger(__name__)
+
+
+def merge_duplicate_sections(apps, schema_editor):
+    """
+    Folds sections repeating a (course, section_id) pair into the oldest
+    one, moving their enrollments and history with them, so the unique
+    constraint can be added.  Merged sections and enrollments are logged,
+    as the merge is not undone when the migration is reversed.  The
+    constraint is added by the next migration, since PostgreSQL won't
+    alter a table with foreign key checks of these deletes pending.
+    """
+    Section = apps.get_model('training_provisioner', 'Section')
+    Enrollment = apps.get_model('training_provisioner', 'Enrollment')
+    EnrollmentHistoryEvent = apps.get_model(
+        'training_provisioner', 'EnrollmentHistoryEvent')
+
+    if Section.objects.filter(section_id__isnull=True).exists():
+        raise RuntimeError(
+            "Sections without a section_id must be removed before "
+            "section_id is made required")
+
+    duplicates = Section.objects.values('course', 'section_id').annotate(
+        kept=Min('pk'), count=Count('pk')).filter(count__gt=1)
+
+    for duplicate in duplicates:
+        kept = duplicate['kept']
+        extras = Section.objects.filter(
+            course=duplicate['course'], section_id=duplicate['section_id']
+        ).exclude(pk=kept).values_list('pk', flat=True)
+
+        for extra in extras:
+            kept_enrollments = dict(Enrollment.objects.filter(
+                section=kept).values_list('integration_id', 'pk'))
+
+            for pk, integration_id in Enrollment.objects.filter(
+                    section=extra, integration_id__in=kept_enrollments
+            ).values_list('pk', 'integration_id'):
+                EnrollmentHistoryEvent.objects.filter(enrollment=pk).update(
+                    enrollment=kept_enrollments[integration_id])
+                Enrollment.objects.filter(pk=pk).delete()
+                logger.warning(
+                    f"Merged enrollment {pk} into "
+                    f"{kept_enrollments[integration_id]}")
+
+            Enrollment.objects.filter(section=extra).update(section=kept)
+            Section.objects.filter(pk=extra).delete()
+            logger.warning(
+                f"Merged section {extra} into {kept} (course "
+                f"{duplicate['course']}, {duplicate['section_id']})")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('training_provisioner', '0016_enrollmenthistoryevent_timestamp_default'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            merge_duplicate_sections, migrations.RunPython.noop),
+    ]
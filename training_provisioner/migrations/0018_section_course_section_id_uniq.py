@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-19 01:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('training_provisioner', '0017_merge_duplicate_sections'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='section',
+            name='section_id',
+            field=models.CharField(max_length=80),
+        ),
+        migrations.AddConstraint(
+            model_name='section',
+            constraint=models.UniqueConstraint(fields=('course', 'section_id'), name='section_course_section_id_uniq'),
+        ),
+    ]
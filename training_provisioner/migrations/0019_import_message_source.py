@@ -0,0 +1,85 @@
+# Generated by Django 5.2.18 on 2026-10-19 02:27
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+import json
+
+
+def _message_count(reported):
+    try:
+        return len(json.loads(reported))
+    except (TypeError, ValueError):
+        return 0 if reported is None else 1
+
+
+def count_import_messages(apps, schema_editor):
+    """
+    Counts the warnings and errors in the json stored for imports
+    monitored before the counts were kept.
+    """
+    Import = apps.get_model('training_provisioner', 'Import')
+
+    for imp in Import.objects.exclude(
+            canvas_warnings__isnull=True, canvas_errors__isnull=True).only(
+                'canvas_warnings', 'canvas_errors').iterator():
+        imp.canvas_warning_count = _message_count(imp.canvas_warnings)
+        imp.canvas_error_count = _message_count(imp.canvas_errors)
+        imp.save(update_fields=['canvas_warning_count', 'canvas_error_count'])
+
+
+def set_message_sources(apps, schema_editor):
+    """
+    Marks the row errors stored by reload_enrollment_errors, and records
+    each message's Canvas import id.
+    """
+    Import = apps.get_model('training_provisioner', 'Import')
+    ImportMessage = apps.get_model('training_provisioner', 'ImportMessage')
+
+    ImportMessage.objects.filter(row__isnull=False).update(source='sis_error')
+    ImportMessage.objects.update(canvas_id=Subquery(Import.objects.filter(
+        pk=OuterRef('queue_id')).values('canvas_id')[:1]))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('training_provisioner', '0018_section_course_section_id_uniq'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='import',
+            name='canvas_error_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='import',
+            name='canvas_warning_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='importmessage',
+            name='canvas_id',
+            field=models.CharField(max_length=30, null=True),
+        ),
+        migrations.AddField(
+            model_name='importmessage',
+            name='source',
+            field=models.SlugField(choices=[('processing', 'Processing message'), ('sis_error', 'SIS import error')], default='processing', max_length=20),
+            preserve_default=False,
+        ),
+        migrations.AlterField(
+            model_name='importmessage',
+            name='queue',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='messages', to='training_provisioner.import'),
+        ),
+        migrations.RunPython(
+            count_import_messages, migrations.RunPython.noop),
+        migrations.RunPython(
+            set_message_sources, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='importmessage',
+            index=models.Index(fields=['canvas_id', 'source'], name='import_mess_canvas__bb9895_idx'),
+        ),
+    ]
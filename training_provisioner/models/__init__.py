@@ -1,8 +1,10 @@
 # Copyright 2026 UW-IT, University of Washington
 # SPDX-License-Identifier: Apache-2.0
 
-from django.db import models
+from django.conf import settings
+from django.db import models, connections, transaction
 from django.db.models import Q
+from django.dispatch import Signal
 from django.utils.timezone import localtime
 from training_provisioner.dao.canvas import (
     sis_import_by_path, get_sis_import_status, delete_sis_import)
@@ -10,7 +12,7 @@ from training_provisioner.exceptions import MissingImportPathException
 from restclients_core.exceptions import DataFailureException
 from prometheus_client import Counter
 from importlib import import_module
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from logging import getLogger
 import json
 import re
@@ -23,6 +25,9 @@ error_counter = Counter('studenttraining_import_errors_total',
                         ('Total number of errors encountered '
                          'during SIS imports'))
 
+# sent after queryset updates, which bypass the post_save signal
+resources_updated = Signal()
+
 
 class ImportResource(models.Model):
     PRIORITY_NONE = 0
@@ -41,11 +46,39 @@ class ImportResource(models.Model):
         abstract = True
 
 
+class ImportResourceManager(models.Manager):
+    def claim(self, queue_id, *args, **kwargs):
+        """
+        Assigns queue_id to the unqueued models matching args and kwargs in
+        a single UPDATE, returning the number of models claimed.  Where
+        supported, candidates are selected FOR UPDATE SKIP LOCKED so that
+        concurrent claims always get disjoint models.
+        """
+        candidates = super(ImportResourceManager, self).get_queryset().filter(
+            *args, queue_id__isnull=True, **kwargs)
+
+        features = connections[self.db].features
+        if features.has_select_for_update_skip_locked:
+            candidates = candidates.select_for_update(
+                skip_locked=True,
+                of=('self',) if features.has_select_for_update_of else ())
+
+        with transaction.atomic(using=self.db, savepoint=False):
+            claimed = super(ImportResourceManager, self).get_queryset(
+                ).filter(pk__in=candidates.values('pk')).update(
+                    queue_id=queue_id)
+
+        resources_updated.send(sender=self.model)
+        return claimed
+
+
 class ImportManager(models.Manager):
     def find_by_requires_update(self):
         return super(ImportManager, self).get_queryset().filter(
-            (Q(canvas_warnings__isnull=True) &
-                Q(canvas_errors__isnull=True)) | Q(monitor_status__gte=500),
+            Q(canvas_warning_count=0, canvas_error_count=0) |
+            Q(monitor_status__gte=500),
+            Q(monitor_next_date__isnull=True) |
+            Q(monitor_next_date__lte=datetime.now(timezone.utc)),
             canvas_id__isnull=False,
             post_status=200)
 
@@ -59,6 +92,8 @@ class Import(models.Model):
         ('enrollment', 'training_provisioner.models.enrollment.Enrollment'),
     )
 
+    TEXT_FIELDS = ('csv_errors', 'canvas_warnings', 'canvas_errors')
+
     csv_type = models.SlugField(max_length=20, choices=CSV_TYPE_CHOICES)
     csv_path = models.CharField(max_length=80, null=True)
     csv_errors = models.TextField(null=True)
@@ -70,11 +105,15 @@ class Import(models.Model):
     post_status = models.SmallIntegerField(null=True)
     monitor_date = models.DateTimeField(null=True)
     monitor_status = models.SmallIntegerField(null=True)
+    monitor_next_date = models.DateTimeField(null=True)
+    monitor_progress_rate = models.FloatField(null=True)
     canvas_id = models.CharField(max_length=30, null=True)
     canvas_state = models.CharField(max_length=80, null=True)
     canvas_progress = models.SmallIntegerField(default=0)
     canvas_warnings = models.TextField(null=True)
     canvas_errors = models.TextField(null=True)
+    canvas_warning_count = models.IntegerField(default=0)
+    canvas_error_count = models.IntegerField(default=0)
 
     objects = ImportManager()
 
@@ -107,47 +146,120 @@ class Import(models.Model):
 
         return sis_import
 
-    def update_import_status(self):
+    def fetch_import_status(self):
         """
-        Updates import attributes, based on the sis import resource.
+        Returns the sis import resource for this import.  Only Canvas is
+        queried, so imports can be fetched concurrently.
+        """
+        return get_sis_import_status(self.canvas_id)
+
+    def update_import_status(self, sis_import=None):
+        """
+        Updates import attributes, based on the sis import resource,
+        fetching the resource if it isn't passed.
         """
         try:
-            sis_import = get_sis_import_status(self.canvas_id)
+            if sis_import is None:
+                sis_import = self.fetch_import_status()
+
+            monitor_date = datetime.now(timezone.utc)
+            progress = int(sis_import.progress or 0)
+            self.schedule_next_monitor(monitor_date, progress)
             self.monitor_status = 200
-            self.monitor_date = datetime.now(timezone.utc)
+            self.monitor_date = monitor_date
             self.canvas_state = sis_import.workflow_state
-            self.canvas_progress = sis_import.progress
-            self.canvas_warnings = None
-            self.canvas_errors = None
+            self.canvas_progress = progress
 
             warnings = self._process_warnings(sis_import.processing_warnings)
+            errors = sis_import.processing_errors
+            self.canvas_warning_count = len(warnings)
+            self.canvas_error_count = len(errors)
+
             if len(warnings):
                 warning_counter.inc(len(warnings))
-                self.canvas_warnings = json.dumps(warnings)
 
-            if len(sis_import.processing_errors):
-                error_counter.inc(len(sis_import.processing_errors))
-                self.canvas_errors = json.dumps(sis_import.processing_errors)
+            if len(errors):
+                error_counter.inc(len(errors))
 
         except (DataFailureException, KeyError) as ex:
             logger.info('Monitor error: {}'.format(ex))
+            self.defer_monitor()
             return
 
         if self.is_cleanly_imported():
             self.delete()
         else:
             self.save()
+            # imports reporting messages are no longer monitored
+            if len(warnings) or len(errors):
+                self.add_messages(warnings, errors)
             if self.is_imported():
                 self.dequeue_dependent_models()
 
+    def add_messages(self, warnings, errors):
+        """
+        Records the filtered processing warnings and errors of an import
+        as ImportMessages, once per message type.
+        """
+        from training_provisioner.models.import_message import ImportMessage
+
+        recorded = set(self.messages.filter(
+            source=ImportMessage.SOURCE_PROCESSING).values_list(
+                'message_type', flat=True))
+
+        if ImportMessage.TYPE_WARNING not in recorded:
+            ImportMessage.objects.add_processing_messages(
+                self, ImportMessage.TYPE_WARNING, warnings)
+        if ImportMessage.TYPE_ERROR not in recorded:
+            ImportMessage.objects.add_processing_messages(
+                self, ImportMessage.TYPE_ERROR, errors)
+
+    def schedule_next_monitor(self, monitor_date, progress):
+        """
+        Sets monitor_next_date to the estimated completion time, based on
+        the progress made since the last monitor_date.  Imports that made
+        no progress back off, doubling the time between polls.
+        """
+        interval = 0
+        if self.monitor_date is not None:
+            elapsed = (monitor_date - self.monitor_date).total_seconds()
+            progressed = (progress or 0) - (self.canvas_progress or 0)
+            if progressed > 0 and elapsed > 0:
+                self.monitor_progress_rate = progressed / elapsed
+                interval = (100 - progress) / self.monitor_progress_rate
+            else:
+                interval = elapsed * 2
+
+        self.monitor_next_date = self._next_monitor_date(
+            monitor_date, interval)
+
+    def defer_monitor(self):
+        """
+        Backs off an import whose status could not be fetched, doubling
+        the time since it was last polled, or added, and saves it.
+        """
+        monitor_date = datetime.now(timezone.utc)
+        last_date = self.monitor_date or self.added_date or monitor_date
+        self.monitor_next_date = self._next_monitor_date(
+            monitor_date, (monitor_date - last_date).total_seconds() * 2)
+        if self.pk:
+            self.save(update_fields=['monitor_next_date'])
+
+    def _next_monitor_date(self, monitor_date, interval):
+        min_interval = getattr(settings, 'MONITOR_IMPORTS_MIN_INTERVAL', 30)
+        max_interval = getattr(settings, 'MONITOR_IMPORTS_MAX_INTERVAL', 900)
+
+        interval = min(max(interval, min_interval), max_interval)
+        return monitor_date + timedelta(seconds=interval)
+
     def is_completed(self):
         return (self.post_status == 200 and
                 self.canvas_progress == 100)
 
     def is_cleanly_imported(self):
         return (self.is_imported() and
-                self.canvas_warnings is None and
-                self.canvas_errors is None)
+                self.canvas_warning_count == 0 and
+                self.canvas_error_count == 0)
 
     def is_imported(self):
         return (self.is_completed() and
@@ -166,10 +278,56 @@ class Import(models.Model):
         return self.dependent_model(
             self.get_csv_type_display()).objects.queued(self.pk)
 
+    def reported_messages(self, csv_file):
+        """
+        Returns the Canvas processing error and warning messages
+        reported against csv_file.  Imports monitored before messages
+        were recorded fall back to their stored canvas_warnings and
+        canvas_errors json.
+        """
+        from training_provisioner.models.import_message import ImportMessage
+
+        if self.pk:
+            processing = self.messages.filter(
+                source=ImportMessage.SOURCE_PROCESSING)
+            if processing.exists():
+                return list(processing.filter(csv_file=csv_file).values_list(
+                    'message', flat=True))
+
+        messages = []
+        for reported in [self.canvas_errors, self.canvas_warnings]:
+            try:
+                messages.extend([message for filename, message in (
+                    json.loads(reported)) if filename == csv_file])
+            except (TypeError, ValueError):
+                pass
+
+        return messages
+
+    def unprovisioned_ids(self, csv_file, sis_ids):
+        """
+        Returns the subset of sis_ids named in messages reported against
+        csv_file.  A message that names none of them could apply to any
+        row, so all of sis_ids are returned.  Where a message names both
+        a course and one of its sections, only the section is returned.
+        """
+        unprovisioned = set()
+        for message in self.reported_messages(csv_file):
+            named = set(re.findall(r'[\w-]+', message)) & sis_ids
+            if not len(named):
+                return set(sis_ids)
+
+            unprovisioned.update([sis_id for sis_id in named if not any(
+                n != sis_id and n.startswith(sis_id) for n in named)])
+
+        return unprovisioned
+
     def dequeue_dependent_models(self):
         for csv_type, model_cls in self.CSV_TYPE_CHOICES:
             self.dependent_model(model_cls).objects.dequeue(self)
 
+        resources_updated.send(sender=Import)
+
     def delete(self, *args, **kwargs):
         self.dequeue_dependent_models()
         if self.canvas_id and not self.is_completed():
@@ -183,8 +341,8 @@ class Import(models.Model):
         return [w for w in warnings if not re.search(
             '-(MSIS|THLEAD)-(480|550|601)-', w[-1])]
 
-    def json_data(self):
-        return {
+    def json_data(self, exclude=()):
+        data = {
             "queue_id": self.pk,
             "type": self.csv_type,
             "csv_path": self.csv_path,
@@ -192,17 +350,32 @@ class Import(models.Model):
             "added_date": localtime(self.added_date).isoformat(),
             "priority": ImportResource.PRIORITY_CHOICES[self.priority][1],
             "override_sis_stickiness": self.override_sis_stickiness,
-            "csv_errors": self.csv_errors,
             "post_status": self.post_status,
             "canvas_state": self.canvas_state,
             "canvas_progress": self.canvas_progress,
-            "canvas_warnings": self.canvas_warnings,
-            "canvas_errors": self.canvas_errors,
             "canvas_id": self.canvas_id,
+            "canvas_warning_count": self.canvas_warning_count,
+            "canvas_error_count": self.canvas_error_count,
         }
 
+        # excluded fields may be deferred, so are never read
+        for field in self.TEXT_FIELDS:
+            if field not in exclude:
+                data[field] = getattr(self, field)
+
+        return data
+
     def __str__(self):
         return f"{self.type_name} import {self.csv_path}"
 
     class Meta:
         db_table = 'import'
+        indexes = [
+            # ImportListView pagination
+            models.Index(
+                fields=['added_date', 'id'], name='import_added_idx'),
+            # find_by_requires_update
+            models.Index(
+                fields=['monitor_next_date'], name='import_monitor_idx',
+                condition=Q(post_status=200, canvas_id__isnull=False)),
+        ]
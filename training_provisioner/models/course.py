@@ -1,10 +1,13 @@
 # Copyright 2026 UW-IT, University of Washington
 # SPDX-License-Identifier: Apache-2.0
 
-from django.db import models
-from django.db.models import F
+from django.db import models, transaction
+from django.db.models import Q
+from django.db.models.functions import Mod
+from django.db.models.lookups import Exact
 from training_provisioner.models.training_course import TrainingCourse
-from training_provisioner.models import Import, ImportResource
+from training_provisioner.models import (
+    Import, ImportResource, ImportResourceManager, resources_updated)
 from training_provisioner.exceptions import EmptyQueueException
 from django.utils.timezone import localtime
 import json
@@ -14,23 +17,39 @@ import logging
 logger = logging.getLogger(__name__)
 
 
-class CourseManager(models.Manager):
+class CourseManager(ImportResourceManager):
     def add_models_for_training_course(self, training_course):
-        courses = []
-        for i, course_id in enumerate(training_course.course_import_ids):
-            course, _ = Course.objects.get_or_create(
-                course_id=course_id, defaults={
-                    'training_course': training_course,
-                    'course_ordinal': i + 1,
-                    'priority': Course.PRIORITY_DEFAULT
-                })
-
-            courses.append(course)
-
-            if _:
+        """
+        Returns the training course's courses, creating the missing ones
+        with a single INSERT.
+        """
+        course_ids = training_course.course_import_ids
+        courses = {course.course_id: course for course in self.filter(
+            course_id__in=course_ids).select_related('training_course')}
+
+        if len(courses) < len(course_ids):
+            with transaction.atomic(using=self.db, savepoint=False):
+                TrainingCourse.objects.lock(training_course)
+                courses.update({
+                    course.course_id: course for course in self.filter(
+                        course_id__in=[
+                            course_id for course_id in course_ids
+                            if course_id not in courses]
+                    ).select_related('training_course')})
+
+                added = self.bulk_create([Course(
+                    training_course=training_course, course_id=course_id,
+                    course_ordinal=i + 1, priority=Course.PRIORITY_DEFAULT)
+                    for i, course_id in enumerate(course_ids)
+                    if course_id not in courses])
+
+            for course in added:
+                courses[course.course_id] = course
                 logger.info(f"added course {course.course_id}")
 
-        return courses
+            resources_updated.send(sender=Course)
+
+        return [courses[course_id] for course_id in course_ids]
 
     def get_courses_by_priority(self, priority):
         return self.filter(priority=priority, deleted_date__isnull=True)
@@ -39,39 +58,53 @@ class CourseManager(models.Manager):
         return self.filter(
             training_course=training_course, deleted_date__isnull=True)
 
-    def queue_by_priority(self, priority):
-        kwargs = {
-            'priority': priority,
-            'queue_id__isnull': True,
-            'provisioned_error__isnull': True
-        }
-
-        pks = super().get_queryset().filter(**kwargs).order_by(
-            F('provisioned_date').asc(nulls_first=True)
-        ).values_list('pk', flat=True)
-
-        if not len(pks):
-            raise EmptyQueueException()
+    def queue_by_priority(self, priority, partition=None):
+        """
+        Queues courses of the given priority for a new Import.  An optional
+        (index, count) partition limits the Import to the courses whose
+        pk modulo count is index, so that count workers can each queue
+        a disjoint share of the backlog.
+        """
+        filters = []
+        if partition is not None:
+            index, count = partition
+            filters.append(Exact(Mod('pk', count), index))
 
-        imp = Import(priority=priority, csv_type='course')
-        imp.save()
+        with transaction.atomic():
+            imp = Import.objects.create(priority=priority, csv_type='course')
 
-        super().get_queryset().filter(pk__in=list(pks)).update(
-            queue_id=imp.pk)
+            if not self.claim(imp.pk, *filters, priority=priority,
+                              provisioned_error__isnull=True):
+                raise EmptyQueueException()
 
         return imp
 
     def queued(self, queue_id):
         return super(CourseManager, self).get_queryset().filter(
-            queue_id=queue_id)
+            queue_id=queue_id).select_related('training_course')
+
+    def provision(self, sis_import):
+        queued = self.queued(sis_import.pk).filter(
+            provisioned_date__isnull=True)
+
+        if len(sis_import.reported_messages('courses.csv')):
+            queued = queued.exclude(
+                course_id__in=sis_import.unprovisioned_ids(
+                    'courses.csv', set(queued.values_list(
+                        'course_id', flat=True))))
+
+        return queued.update(provisioned_date=localtime())
 
     def dequeue(self, sis_import):
         if sis_import.is_imported():
-            # Decrement the priority
+            self.provision(sis_import)
+
+            # Imported models need no further import, including those
+            # bumped above the default priority
             super(CourseManager, self).get_queryset().filter(
                 queue_id=sis_import.pk, priority__gt=Course.PRIORITY_NONE
             ).update(
-                queue_id=None, priority=F('priority') - 1)
+                queue_id=None, priority=Course.PRIORITY_NONE)
         else:
             self.queued(sis_import.pk).update(queue_id=None)
 
@@ -88,6 +121,8 @@ class Course(ImportResource):
     provisioned_date = models.DateTimeField(null=True)
     provisioned_error = models.BooleanField(null=True)
     provisioned_status = models.CharField(max_length=512, null=True)
+    published_date = models.DateTimeField(null=True)
+    published_status = models.CharField(max_length=20, null=True)
     deleted_date = models.DateTimeField(null=True)
     priority = models.SmallIntegerField(
         default=ImportResource.PRIORITY_DEFAULT,
@@ -180,3 +215,14 @@ class Course(ImportResource):
 
     class Meta:
         db_table = 'course'
+        indexes = [
+            # queue_by_priority
+            models.Index(
+                fields=['priority'], name='course_queue_idx',
+                condition=Q(queue_id__isnull=True,
+                            provisioned_error__isnull=True)),
+            # queued and dequeue
+            models.Index(
+                fields=['queue_id'], name='course_queued_idx',
+                condition=Q(queue_id__isnull=False)),
+        ]
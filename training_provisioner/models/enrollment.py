@@ -1,15 +1,17 @@
 # Copyright 2026 UW-IT, University of Washington
 # SPDX-License-Identifier: Apache-2.0
 
-from django.db import models
-from django.db.models import F
-from training_provisioner.models import ImportResource
+from django.db import models, transaction
+from django.db.models import Q
+from training_provisioner.models import (
+    ImportResource, ImportResourceManager, resources_updated)
 from training_provisioner.models.course import Course
 from training_provisioner.models.section import Section
 from training_provisioner.models.training_course import TrainingCourse
 from training_provisioner.exceptions import (
     MissingCourseException, MissingSectionException, EnrollmentCourseMismatch,
     DataAccessException)
+from django.utils import timezone
 from django.utils.timezone import localtime
 import re
 import logging
@@ -20,7 +22,7 @@ import time
 logger = logging.getLogger(__name__)
 
 
-class EnrollmentManager(models.Manager):
+class EnrollmentManager(ImportResourceManager):
     def add_models_for_training_course(self, training_course: TrainingCourse):
         # Entrypoint for model loading for enrollments
         # Studentno will be integration_id in Canvas import.
@@ -70,14 +72,19 @@ class EnrollmentManager(models.Manager):
 
         # Iterate through filtered candidates and add/update enrollments,
         # removing from enrolled_studentnos set as we go
-        for studentno in filtered_candidates:
-            studentno = str(studentno)  # Ensure type consistency
+        studentnos = [str(s) for s in filtered_candidates]
+        course_models = self._course_models(training_course)
+        for studentno, course_id, section_id in zip(
+                studentnos, *training_course.
+                get_course_and_section_ids_for_members(studentnos)):
             try:
                 # Get eligible terms for this student from the membership data
                 eligible_terms = membership_candidates.get(studentno, [])
                 enrollment = self._add_enrollment(studentno,
                                                   training_course,
-                                                  eligible_terms)
+                                                  eligible_terms,
+                                                  (course_id, section_id),
+                                                  course_models)
                 enrollments.append(enrollment)
                 enrolled_studentnos.discard(studentno)
                 enrollments_added += 1
@@ -97,6 +104,7 @@ class EnrollmentManager(models.Manager):
                     continue
                 enrollment.deleted_date = now
                 enrollment.priority = ImportResource.PRIORITY_DEFAULT
+                enrollment.provisioned_date = None
                 enrollment.save()
 
                 # Create history event for deletion
@@ -312,22 +320,46 @@ class EnrollmentManager(models.Manager):
 
         return previous_101_enrollments
 
-    def _add_enrollment(self, studentno, training_course, eligible_terms=None):
+    def _course_models(self, training_course):
+        # the training course's courses and sections, by id
+        courses = {course.course_id: course for course in
+                   Course.objects.filter(training_course=training_course)}
+        sections = {section.section_id: section for section in
+                    Section.objects.filter(course__in=courses.values())}
+        return courses, sections
+
+    def _add_enrollment(self, studentno, training_course, eligible_terms=None,
+                        assignment=None, course_models=None):
         # Add or update enrollment for a given student in the training course
         # eligible_terms should be a list of term codes,
         # eg: ['20254A', '20261R']
+        # assignment is the (course_id, section_id) pair, and course_models
+        # the _course_models lookups, if already computed for a batch of
+        # students
         if eligible_terms is None:
             eligible_terms = []
 
+        if assignment is None:
+            assignment = [ids[0] for ids in training_course.
+                          get_course_and_section_ids_for_members([studentno])]
+
+        if course_models is None:
+            course_models = self._course_models(training_course)
+
         try:
-            # Get the course this student should be enrolled in
-            course_id = training_course.get_course_id_for_member(studentno)
-            course = Course.objects.get(course_id=course_id)
-
-            # Get the section this student should be enrolled in (if any)
-            section_id = course.get_section_id_for_member(studentno)
-            section = (Section.objects.get(section_id=section_id)
-                       if section_id is not None else None)
+            # Get the course and section (if any) this student should be
+            # enrolled in
+            course_id, section_id = assignment
+            courses, sections = course_models
+            if course_id not in courses:
+                raise Course.DoesNotExist()
+            course = courses[course_id]
+
+            section = None
+            if section_id is not None:
+                if section_id not in sections:
+                    raise Section.DoesNotExist()
+                section = sections[section_id]
             # priority = Enrollment.PRIORITY_DEFAULT
 
             # Attempt to get an existing enrollment for this student in this
@@ -343,6 +375,7 @@ class EnrollmentManager(models.Manager):
                 # course. Reactivate it as a reenrollment
                 enrollment.deleted_date = None
                 enrollment.priority = ImportResource.PRIORITY_DEFAULT
+                enrollment.provisioned_date = None
 
                 # Merge new eligible terms with existing ones
                 enrollment.merge_eligible_terms(eligible_terms)
@@ -378,17 +411,18 @@ class EnrollmentManager(models.Manager):
                         previous_terms=previous_terms
                     )
 
-            if enrollment.course != course:
+            if enrollment.course_id != course.pk:
                 raise EnrollmentCourseMismatch(
                     f"Enrollment for {studentno} course change from "
                     f"{enrollment.course} to {course} NOT allowed")
-            elif enrollment.section != section:
+            elif enrollment.section_id != (section.pk if section else None):
                 orig_course_id = enrollment.course.course_id
                 orig_section_id = (enrollment.section.section_id
                                    if enrollment.section else None)
                 # deactivate old enrollment
                 enrollment.deleted_date = localtime()
                 enrollment.priority = ImportResource.PRIORITY_DEFAULT
+                enrollment.provisioned_date = None
                 enrollment.save()
 
                 # Create history event for deletion due to section change
@@ -401,6 +435,7 @@ class EnrollmentManager(models.Manager):
                     integration_id=studentno, course=course, section=section)
                 enrollment.deleted_date = None
                 enrollment.priority = ImportResource.PRIORITY_DEFAULT
+                enrollment.provisioned_date = None
                 # Merge eligible terms with existing enrollment
                 enrollment.merge_eligible_terms(eligible_terms)
                 enrollment.save()
@@ -446,6 +481,62 @@ class EnrollmentManager(models.Manager):
 
         return enrollment
 
+    def requeue(self, enrollments, priority=ImportResource.PRIORITY_DEFAULT):
+        """
+        Resets enrollments to unprovisioned at priority, raising their
+        courses to at least priority, and records a requeued event for
+        each.  Returns the number of enrollments requeued.
+        """
+        return self._update_with_events(
+            enrollments, EnrollmentHistoryEvent.EVENT_TYPE_REQUEUED, priority,
+            provisioned_date=None, priority=priority)
+
+    def mark_deleted(self, enrollments):
+        """
+        Marks the active enrollments among enrollments deleted, queueing
+        their courses, and records a deleted event for each.  Returns the
+        number of enrollments deleted.
+        """
+        return self._update_with_events(
+            enrollments.filter(deleted_date__isnull=True),
+            EnrollmentHistoryEvent.EVENT_TYPE_DELETED,
+            ImportResource.PRIORITY_DEFAULT, deleted_date=localtime(),
+            provisioned_date=None, priority=ImportResource.PRIORITY_DEFAULT)
+
+    def _update_with_events(self, enrollments, event_type, course_priority,
+                            **values):
+        # batched updates and history inserts of the selected rows, so
+        # rows matching after the select get neither
+        with transaction.atomic(using=self.db, savepoint=False):
+            rows = list(enrollments.values_list(
+                'pk', 'integration_id', 'course_id', 'course__course_id',
+                'section__section_id', 'eligible_terms'))
+
+            count = 0
+            batch_size = EnrollmentHistoryEvent.BATCH_SIZE
+            for start in range(0, len(rows), batch_size):
+                count += self.filter(pk__in=[
+                    row[0] for row in rows[start:start + batch_size]
+                ]).update(**values)
+
+            EnrollmentHistoryEvent.objects.bulk_create([
+                EnrollmentHistoryEvent(
+                    enrollment_id=pk, event_type=event_type,
+                    integration_id=integration_id, course_id=course_id,
+                    section_id=section_id,
+                    eligible_terms=eligible_terms or [])
+                for (pk, integration_id, course_pk, course_id, section_id,
+                     eligible_terms) in rows],
+                batch_size=EnrollmentHistoryEvent.BATCH_SIZE)
+
+            Course.objects.filter(
+                pk__in=set([row[2] for row in rows]),
+                priority__lt=course_priority
+            ).update(priority=course_priority)
+
+        resources_updated.send(sender=Enrollment)
+        return count
+
     def _trigger_course_import(self, course):
         # bump course import priority to signal cascading import
         if course.priority == Course.PRIORITY_NONE:
@@ -456,30 +547,57 @@ class EnrollmentManager(models.Manager):
         return self.filter(course__training_course=training_course,
                            deleted_date__isnull=True)
 
-    def course_imports(self, course):
-        pks = super(EnrollmentManager, self).get_queryset().filter(
-            course=course.id,
-            priority__gt=ImportResource.PRIORITY_NONE,
-            queue_id__isnull=True
-        ).values_list('pk', flat=True)
+    def course_imports(self, courses):
+        """
+        Returns the unqueued prioritized models for courses.
+        """
+        return super(EnrollmentManager, self).get_queryset().filter(
+            course__in=courses, queue_id__isnull=True,
+            priority__gt=ImportResource.PRIORITY_NONE)
 
-        super(EnrollmentManager, self).get_queryset().filter(
-            pk__in=list(pks)).update(queue_id=course.queue_id)
+    def queue_course_imports(self, queue_id):
+        """
+        Claims the prioritized models of the courses queued for the
+        queue_id import with a single UPDATE, returning every model
+        queued for it.
+        """
+        self.claim(queue_id, course__queue_id=queue_id,
+                   priority__gt=ImportResource.PRIORITY_NONE)
 
-        return super(EnrollmentManager, self).get_queryset().filter(
-            pk__in=list(pks))
+        return self.queued(queue_id)
 
     def queued(self, queue_id):
         return super(EnrollmentManager, self).get_queryset().filter(
             queue_id=queue_id)
 
+    def provision(self, sis_import):
+        queued = self.queued(sis_import.pk).filter(
+            provisioned_date__isnull=True)
+
+        if len(sis_import.reported_messages('enrollments.csv')):
+            # enrollment rows are identified by course or section sis id
+            sis_ids = set(queued.values_list(
+                'course__course_id', flat=True).distinct())
+            sis_ids.update(queued.filter(section__isnull=False).values_list(
+                'section__section_id', flat=True).distinct())
+            unprovisioned = sis_import.unprovisioned_ids(
+                'enrollments.csv', sis_ids)
+            queued = queued.exclude(
+                course__course_id__in=unprovisioned).exclude(
+                    section__section_id__in=unprovisioned)
+
+        return queued.update(provisioned_date=localtime())
+
     def dequeue(self, sis_import):
         if sis_import.is_imported():
-            # Decrement the priority
+            self.provision(sis_import)
+
+            # Imported models need no further import, including those
+            # bumped above the default priority
             super(EnrollmentManager, self).get_queryset().filter(
                 queue_id=sis_import.pk, priority__gt=Enrollment.PRIORITY_NONE
             ).update(
-                queue_id=None, priority=F('priority') - 1)
+                queue_id=None, priority=Enrollment.PRIORITY_NONE)
         else:
             self.queued(sis_import.pk).update(queue_id=None)
 
@@ -573,10 +691,11 @@ class Enrollment(ImportResource):
             ]
         ).values('timestamp', 'eligible_terms', 'previous_eligible_terms')
 
-    def json_data(self):
+    def json_data(self, course_data=None, section_data=None):
         return {
-            'course': self.course.json_data(),
-            'section': self.section.json_data() if self.section else None,
+            'course': course_data or self.course.json_data(),
+            'section': section_data or (
+                self.section.json_data() if self.section else None),
             'integration_id': self.integration_id,
             'eligible_terms': self.eligible_terms,
             'created_date': localtime(self.created_date).isoformat(),
@@ -589,11 +708,26 @@ class Enrollment(ImportResource):
         }
 
     def __str__(self):
-        return json.dumps(self.json_data())
+        return f"{self.integration_id} in {self.course.course_id}"
 
     class Meta:
         db_table = 'enrollment'
         unique_together = ('integration_id', 'course', 'section')
+        indexes = [
+            # course_imports
+            models.Index(
+                fields=['course', 'priority'], name='enrollment_import_idx',
+                condition=Q(queue_id__isnull=True)),
+            # queued and dequeue
+            models.Index(
+                fields=['queue_id'], name='enrollment_queued_idx',
+                condition=Q(queue_id__isnull=False)),
+            # eligibility checks
+            models.Index(
+                fields=['integration_id', 'course'],
+                name='enrollment_active_idx',
+                condition=Q(deleted_date__isnull=True)),
+        ]
 
 
 class EnrollmentHistoryEventManager(models.Manager):
@@ -657,6 +791,7 @@ class EnrollmentHistoryEvent(models.Model):
     EVENT_TYPE_DELETED = 'deleted'
     EVENT_TYPE_MOVED = 'moved'
     EVENT_TYPE_REACTIVATED = 'reactivated'
+    EVENT_TYPE_REQUEUED = 'requeued'
 
     EVENT_TYPE_CHOICES = (
         (EVENT_TYPE_CREATED, 'Enrollment Created'),
@@ -664,8 +799,11 @@ class EnrollmentHistoryEvent(models.Model):
         (EVENT_TYPE_DELETED, 'Enrollment Deleted'),
         (EVENT_TYPE_MOVED, 'Enrollment Moved'),
         (EVENT_TYPE_REACTIVATED, 'Enrollment Reactivated'),
+        (EVENT_TYPE_REQUEUED, 'Enrollment Requeued'),
     )
 
+    BATCH_SIZE = 1000
+
     # Relationship
     enrollment = models.ForeignKey(
         Enrollment,
@@ -679,7 +817,10 @@ class EnrollmentHistoryEvent(models.Model):
         choices=EVENT_TYPE_CHOICES,
         db_index=True
     )
-    timestamp = models.DateTimeField(auto_now_add=True, db_index=True)
+    # defaults rather than auto_now_add so backfilled events can carry
+    # the time their enrollment was created
+    timestamp = models.DateTimeField(
+        default=timezone.now, editable=False, db_index=True)
 
     # Enrollment state snapshot at time of event
     integration_id = models.CharField(max_length=8, db_index=True)
@@ -767,4 +908,8 @@ class EnrollmentHistoryEvent(models.Model):
             models.Index(fields=['integration_id', 'timestamp']),
             models.Index(fields=['event_type', 'timestamp']),
             models.Index(fields=['course_id', 'timestamp']),
+            # admin course_id prefix search
+            models.Index(fields=['course_id'],
+                         name='history_course_id_like_idx',
+                         opclasses=['varchar_pattern_ops']),
         ]
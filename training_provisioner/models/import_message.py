@@ -0,0 +1,162 @@
+# Copyright 2026 UW-IT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+from django.db import models
+from training_provisioner.models import Import
+import json
+import re
+
+
+class ImportMessageManager(models.Manager):
+    BATCH_SIZE = 500
+
+    def add_processing_messages(self, imp, message_type, messages):
+        """
+        Records the [csv_file, message] pairs Canvas reports as an
+        import's processing warnings or errors.
+        """
+        return self.bulk_create([ImportMessage(
+            queue=imp, canvas_id=imp.canvas_id,
+            source=ImportMessage.SOURCE_PROCESSING,
+            message_type=message_type, csv_file=csv_file, message=message,
+            **ImportMessage.parse_message(message))
+            for csv_file, message in messages], batch_size=self.BATCH_SIZE)
+
+    def add_import_errors(self, imp, sis_errors):
+        """
+        Records Canvas SIS import error resources, which carry the csv row
+        that caused them, as they are streamed from Canvas.  Errors of a
+        Canvas import with no local Import are recorded without one.
+        """
+        return self.bulk_create([
+            ImportMessage.from_sis_error(imp, sis_error)
+            for sis_error in sis_errors], batch_size=self.BATCH_SIZE)
+
+    def import_errors(self, canvas_id):
+        """
+        Returns the SIS import errors recorded for a Canvas import.
+        """
+        return self.filter(
+            canvas_id=canvas_id, source=ImportMessage.SOURCE_SIS_ERROR)
+
+    def users_not_found(self, canvas_id):
+        """
+        Returns the enrollment rows Canvas rejected because their user
+        did not exist.
+        """
+        return self.import_errors(canvas_id).filter(
+            csv_file='enrollments.csv',
+            message_class=ImportMessage.CLASS_USER_NOT_FOUND)
+
+
+class ImportMessage(models.Model):
+    """
+    A warning or error Canvas reported while importing an Import's csv
+    files, with the ids it names parsed out for querying.
+    """
+    TYPE_WARNING = 'warning'
+    TYPE_ERROR = 'error'
+
+    TYPE_CHOICES = (
+        (TYPE_WARNING, 'Warning'),
+        (TYPE_ERROR, 'Error'),
+    )
+
+    SOURCE_PROCESSING = 'processing'
+    SOURCE_SIS_ERROR = 'sis_error'
+
+    SOURCE_CHOICES = (
+        (SOURCE_PROCESSING, 'Processing message'),
+        (SOURCE_SIS_ERROR, 'SIS import error'),
+    )
+
+    CLASS_USER_NOT_FOUND = 'user_not_found'
+    CLASS_COURSE_NOT_FOUND = 'course_not_found'
+
+    CLASS_CHOICES = (
+        (CLASS_USER_NOT_FOUND, 'User not found'),
+        (CLASS_COURSE_NOT_FOUND, 'Course not found'),
+    )
+
+    CLASS_PATTERNS = (
+        (CLASS_USER_NOT_FOUND, re.compile(r'^User not found')),
+        (CLASS_COURSE_NOT_FOUND, re.compile(
+            r'^Neither course nor section existed')),
+    )
+
+    queue = models.ForeignKey(
+        Import, on_delete=models.CASCADE, related_name='messages', null=True)
+    canvas_id = models.CharField(max_length=30, null=True)
+    source = models.SlugField(max_length=20, choices=SOURCE_CHOICES)
+    message_type = models.SlugField(max_length=20, choices=TYPE_CHOICES)
+    message_class = models.SlugField(
+        max_length=40, choices=CLASS_CHOICES, null=True)
+    csv_file = models.CharField(max_length=40)
+    row = models.IntegerField(null=True)
+    course_id = models.CharField(max_length=80, null=True)
+    section_id = models.CharField(max_length=80, null=True)
+    integration_id = models.CharField(max_length=32, null=True)
+    message = models.TextField()
+
+    objects = ImportMessageManager()
+
+    @staticmethod
+    def parse_message(message):
+        """
+        Returns the message class and the course and section ids named
+        in a Canvas message.
+        """
+        parsed = {'message_class': None}
+        for message_class, pattern in ImportMessage.CLASS_PATTERNS:
+            if pattern.search(message):
+                parsed['message_class'] = message_class
+                break
+
+        for field, label in [('course_id', 'Course ID'),
+                             ('section_id', 'Section ID')]:
+            match = re.search(label + r': ([^,)\s]+)', message)
+            parsed[field] = match.group(1) if match else None
+
+        return parsed
+
+    @staticmethod
+    def parse_row_info(row_info):
+        """
+        Returns the csv row Canvas reports as a ruby hash inspection.
+        """
+        json_row = re.sub(
+            r'([{ ])([A-Za-z_]+):', '\\1"\\2":', row_info)
+        json_row = re.sub(r' nil([,}])', ' null\\1', json_row)
+        return json.loads(json_row)[0]
+
+    @staticmethod
+    def from_sis_error(imp, sis_error):
+        message = ImportMessage(
+            queue=imp, canvas_id=str(sis_error.import_id),
+            source=ImportMessage.SOURCE_SIS_ERROR,
+            message_type=ImportMessage.TYPE_ERROR,
+            csv_file=sis_error.import_file, row=sis_error.row,
+            message=sis_error.message,
+            **ImportMessage.parse_message(sis_error.message))
+
+        try:
+            row = ImportMessage.parse_row_info(sis_error.row_info)
+            message.course_id = row.get('course_id') or message.course_id
+            message.section_id = row.get('section_id') or message.section_id
+            message.integration_id = row.get('user_integration_id')
+        except (TypeError, ValueError, IndexError, AttributeError):
+            pass
+
+        return message
+
+    def __str__(self):
+        return f"{self.csv_file}: {self.message}"
+
+    class Meta:
+        db_table = 'import_message'
+        indexes = [
+            models.Index(fields=['queue', 'csv_file']),
+            models.Index(fields=['canvas_id', 'source']),
+            models.Index(fields=['message_class', 'course_id']),
+            models.Index(fields=['integration_id']),
+        ]
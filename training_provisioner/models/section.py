@@ -1,9 +1,10 @@
 # Copyright 2026 UW-IT, University of Washington
 # SPDX-License-Identifier: Apache-2.0
 
-from django.db import models
-from django.db.models import F
-from training_provisioner.models import ImportResource
+from django.db import models, transaction
+from django.db.models import Q
+from training_provisioner.models import (
+    ImportResource, ImportResourceManager, resources_updated)
 from training_provisioner.models.training_course import TrainingCourse
 from training_provisioner.models.course import Course
 from training_provisioner.exceptions import MissingCourseException
@@ -15,58 +16,102 @@ import logging
 logger = logging.getLogger(__name__)
 
 
-class SectionManager(models.Manager):
+class SectionManager(ImportResourceManager):
     def add_models_for_training_course(self, training_course):
-        sections = []
-        for course_id in training_course.course_import_ids:
-            try:
-                course = Course.objects.get(
-                    training_course=training_course,
-                    course_id=course_id)
-            except Course.DoesNotExist:
+        """
+        Returns the sections of the training course's courses, creating
+        the missing ones with a single INSERT.
+        """
+        course_ids = training_course.course_import_ids
+        courses = {course.course_id: course for course in (
+            Course.objects.filter(
+                training_course=training_course, course_id__in=course_ids
+            ).select_related('training_course'))}
+
+        for course_id in course_ids:
+            if course_id not in courses:
                 raise MissingCourseException(
                     f"Course {course_id} model not found for ")
 
-            for i, section_id in enumerate(course.section_import_ids):
-                section, _ = Section.objects.get_or_create(
-                    course=course, section_id=section_id, defaults={
-                        'priority': Section.PRIORITY_DEFAULT,
-                        'section_ordinal': i + 1})
-                sections.append(section)
+        sections = self._sections_by_id(courses.values())
 
-                if _:
-                    logger.info(f"added section {section.section_id}")
+        if any((course.pk, section_id) not in sections
+               for course in courses.values()
+               for section_id in course.section_import_ids):
+            with transaction.atomic(using=self.db, savepoint=False):
+                TrainingCourse.objects.lock(training_course)
+                sections = self._sections_by_id(courses.values())
 
-        return sections
+                added = self.bulk_create([Section(
+                    course=course, section_id=section_id,
+                    section_ordinal=i + 1, priority=Section.PRIORITY_DEFAULT)
+                    for course in courses.values()
+                    for i, section_id in enumerate(course.section_import_ids)
+                    if (course.pk, section_id) not in sections])
+
+            for section in added:
+                sections[(section.course_id, section.section_id)] = section
+                logger.info(f"added section {section.section_id}")
+
+            resources_updated.send(sender=Section)
+
+        return [sections[(courses[course_id].pk, section_id)]
+                for course_id in course_ids
+                for section_id in courses[course_id].section_import_ids]
+
+    def _sections_by_id(self, courses):
+        return {(section.course_id, section.section_id): section
+                for section in self.filter(course__in=courses)}
 
     def get_models_for_training_course(self, training_course):
         return self.filter(
             course__training_course=training_course, deleted_date__isnull=True)
 
-    def course_imports(self, course):
-        pks = super(SectionManager, self).get_queryset().filter(
-            course=course.id,
-            priority__gt=ImportResource.PRIORITY_NONE,
-            queue_id__isnull=True
-        ).values_list('pk', flat=True)
+    def course_imports(self, courses):
+        """
+        Returns the unqueued prioritized models for courses.
+        """
+        return super(SectionManager, self).get_queryset().filter(
+            course__in=courses, queue_id__isnull=True,
+            priority__gt=ImportResource.PRIORITY_NONE)
 
-        super(SectionManager, self).get_queryset().filter(
-            pk__in=list(pks)).update(queue_id=course.queue_id)
+    def queue_course_imports(self, queue_id):
+        """
+        Claims the prioritized models of the courses queued for the
+        queue_id import with a single UPDATE, returning every model
+        queued for it.
+        """
+        self.claim(queue_id, course__queue_id=queue_id,
+                   priority__gt=ImportResource.PRIORITY_NONE)
 
-        return super(SectionManager, self).get_queryset().filter(
-            pk__in=list(pks))
+        return self.queued(queue_id)
 
     def queued(self, queue_id):
         return super(SectionManager, self).get_queryset().filter(
             queue_id=queue_id)
 
+    def provision(self, sis_import):
+        queued = self.queued(sis_import.pk).filter(
+            provisioned_date__isnull=True)
+
+        if len(sis_import.reported_messages('sections.csv')):
+            queued = queued.exclude(
+                section_id__in=sis_import.unprovisioned_ids(
+                    'sections.csv', set(queued.values_list(
+                        'section_id', flat=True))))
+
+        return queued.update(provisioned_date=localtime())
+
     def dequeue(self, sis_import):
         if sis_import.is_imported():
-            # Decrement the priority
+            self.provision(sis_import)
+
+            # Imported models need no further import, including those
+            # bumped above the default priority
             super(SectionManager, self).get_queryset().filter(
                 queue_id=sis_import.pk, priority__gt=Section.PRIORITY_NONE
             ).update(
-                queue_id=None, priority=F('priority') - 1)
+                queue_id=None, priority=Section.PRIORITY_NONE)
         else:
             self.queued(sis_import.pk).update(queue_id=None)
 
@@ -76,7 +121,7 @@ class Section(ImportResource):
     Provisioned Training Course Section
     """
     course = models.ForeignKey(Course, on_delete=models.CASCADE)
-    section_id = models.CharField(max_length=80, null=True)
+    section_id = models.CharField(max_length=80)
     section_ordinal = models.IntegerField()
     created_date = models.DateTimeField(auto_now=True)
     provisioned_date = models.DateTimeField(null=True)
@@ -92,12 +137,12 @@ class Section(ImportResource):
     def section_letter(self):
         return self.course.section_letter(self.section_ordinal - 1)
 
-    def json_data(self):
+    def json_data(self, course_data=None):
         return {
             "section_id": self.section_id,
             "section_ordinal": self.section_ordinal,
-            "course": self.course.json_data(),
-            "created_date": localtime(self.deleted_date).isoformat(),
+            "course": course_data or self.course.json_data(),
+            "created_date": localtime(self.created_date).isoformat(),
             "provisioned_date": localtime(
                 self.provisioned_date).isoformat() if (
                     self.provisioned_date is not None) else None,
@@ -110,3 +155,19 @@ class Section(ImportResource):
 
     class Meta:
         db_table = 'section'
+        indexes = [
+            # course_imports
+            models.Index(
+                fields=['course', 'priority'], name='section_import_idx',
+                condition=Q(queue_id__isnull=True)),
+            # queued and dequeue
+            models.Index(
+                fields=['queue_id'], name='section_queued_idx',
+                condition=Q(queue_id__isnull=False)),
+        ]
+        constraints = [
+            # add_models_for_training_course creates each section once
+            models.UniqueConstraint(
+                fields=['course', 'section_id'],
+                name='section_course_section_id_uniq'),
+        ]
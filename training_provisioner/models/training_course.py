@@ -8,11 +8,45 @@ from training_provisioner.dao.membership import (
     test_membership, title_vi_membership_candidates,
     title_vi_booster_membership_candidates)
 from importlib import import_module
+import numpy as np
 import logging
 
 
 logger = logging.getLogger(__name__)
 
+# longest integration_id whose value is computed in an int64
+MAX_HASH_DIGITS = 18
+
+
+def hash_members(integration_ids):
+    """
+    Returns arrays of int(integration_id), as TrainingCourse._hash
+    computes, and of the sum of integration_id's character ordinals, as
+    Course._hash computes, for each of integration_ids.  Ids that are not
+    plain ascii digits fall back to those per-member definitions.
+    """
+    ids = np.ascontiguousarray(integration_ids)
+    if ids.dtype.kind in 'iu':
+        ids = ids.astype(str)
+
+    width = ids.itemsize // 4
+    if ids.dtype.kind == 'U' and len(ids) and 0 < width <= MAX_HASH_DIGITS:
+        # one row of unicode code points per id, zero padded
+        codes = ids.view(np.uint32).reshape(len(ids), width).astype(np.int64)
+        lengths = np.count_nonzero(codes, axis=1)
+        in_id = np.arange(width) < lengths[:, np.newaxis]
+        digits = codes - ord('0')
+        if (lengths > 0).all() and (
+                (digits >= 0) & (digits <= 9) | ~in_id).all():
+            values = np.zeros(len(ids), dtype=np.int64)
+            for column in range(width):
+                values = np.where(in_id[:, column],
+                                  values * 10 + digits[:, column], values)
+            return values, codes.sum(axis=1)
+
+    return (np.array([int(i) for i in ids], dtype=object),
+            np.array([sum(map(ord, str(i))) for i in ids], dtype=object))
+
 
 class TrainingCourseManager(models.Manager):
     def active_courses(self, term_id=None):
@@ -26,6 +60,14 @@ class TrainingCourseManager(models.Manager):
 
         return self.filter(**filter)
 
+    def lock(self, training_course):
+        """
+        Locks the training course row until the end of the current
+        transaction, so loaders of the same training course take turns.
+        """
+        list(self.select_for_update().filter(
+            pk=training_course.pk).values_list('pk', flat=True))
+
     def load_active_courses(self):
         # Get active courses and sort by term_id to process earlier academic
         # years first. This prevents race conditions when checking for
@@ -134,7 +176,7 @@ class TrainingCourse(models.Model):
         if self.pk:
             model = self._dependent_model(*self.COURSE_MODEL)
             model.objects.get_models_for_training_course(self).update(
-                priority=model.PRIORITY_DEFAULT)
+                priority=model.PRIORITY_DEFAULT, provisioned_date=None)
 
         super().save(force_update, *args, **kwargs)
 
@@ -194,6 +236,29 @@ class TrainingCourse(models.Model):
         """
         return int(integration_id)
 
+    def get_course_and_section_ids_for_members(self, integration_ids):
+        """
+        Returns arrays of the course_id and section_id (or None) that
+        get_course_id_for_member and Course.get_section_id_for_member
+        assign to each of integration_ids, computed for the whole batch.
+        """
+        values, ordinal_sums = hash_members(integration_ids)
+        course_indexes = (values % self.course_count).astype(np.intp)
+        course_ids = np.array(self.course_import_ids, dtype=object)
+
+        if not self.section_count:
+            return (course_ids[course_indexes],
+                    np.full(len(course_indexes), None, dtype=object))
+
+        model = self._dependent_model(*self.COURSE_MODEL)
+        section_ids = np.array([model(
+            course_id=course_id, training_course=self).section_import_ids
+            for course_id in self.course_import_ids], dtype=object)
+        section_indexes = (ordinal_sums % self.section_count).astype(np.intp)
+
+        return (course_ids[course_indexes],
+                section_ids[course_indexes, section_indexes])
+
     def load_courses_and_enrollments(self):
         # Entrypoint for loading jobs for sections, enrollments
         for model in self._dependent_models():
@@ -0,0 +1,45 @@
+# Copyright 2026 UW-IT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+from training_provisioner.models import resources_updated
+from training_provisioner.models.course import Course
+from training_provisioner.models.enrollment import Enrollment
+from training_provisioner.models.section import Section
+from training_provisioner.models.training_course import TrainingCourse
+from training_provisioner.views.api.authentication import token_cache_key
+from training_provisioner.views.api.cache import invalidate_enrollments
+
+
+@receiver(post_save, sender=Token)
+@receiver(post_delete, sender=Token)
+def invalidate_token(sender, instance, **kwargs):
+    cache.delete(token_cache_key(instance.key))
+
+
+@receiver(post_save, sender=User)
+def invalidate_user_tokens(sender, instance, **kwargs):
+    # cached tokens carry their user, so is_active changes must evict them
+    cache.delete_many([token_cache_key(key) for key in (
+        Token.objects.filter(user=instance).values_list('key', flat=True))])
+
+
+@receiver(post_save, sender=Enrollment)
+@receiver(post_delete, sender=Enrollment)
+def invalidate_student_enrollments(sender, instance, **kwargs):
+    invalidate_enrollments(instance.integration_id)
+
+
+@receiver(post_save, sender=TrainingCourse)
+@receiver(post_delete, sender=TrainingCourse)
+@receiver(post_save, sender=Course)
+@receiver(post_delete, sender=Course)
+@receiver(post_save, sender=Section)
+@receiver(post_delete, sender=Section)
+@receiver(resources_updated)
+def invalidate_all_enrollments(sender, **kwargs):
+    invalidate_enrollments()
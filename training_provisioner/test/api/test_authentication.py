@@ -0,0 +1,61 @@
+# Copyright 2026 UW-IT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import AuthenticationFailed
+from training_provisioner.views.api.authentication import (
+    CachedTokenAuthentication, token_cache_key)
+from io import StringIO
+
+
+class CachedTokenAuthenticationTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create(username='javerage')
+        self.token = Token.objects.create(user=self.user)
+        self.auth = CachedTokenAuthentication()
+
+    def test_authenticate_cached(self):
+        with self.assertNumQueries(1):
+            user, token = self.auth.authenticate_credentials(self.token.key)
+        self.assertEqual(user, self.user)
+
+        with self.assertNumQueries(0):
+            user, token = self.auth.authenticate_credentials(self.token.key)
+        self.assertEqual(user, self.user)
+        self.assertEqual(token.key, self.token.key)
+
+    def test_invalid_token(self):
+        self.assertRaises(AuthenticationFailed,
+                          self.auth.authenticate_credentials, 'bogus')
+        self.assertIsNone(cache.get(token_cache_key('bogus')))
+
+    def test_token_deleted(self):
+        self.auth.authenticate_credentials(self.token.key)
+        self.token.delete()
+        self.assertIsNone(cache.get(token_cache_key(self.token.key)))
+        self.assertRaises(AuthenticationFailed,
+                          self.auth.authenticate_credentials, self.token.key)
+
+    def test_token_reset(self):
+        self.auth.authenticate_credentials(self.token.key)
+        call_command('create_auth_token', 'javerage', '--reset',
+                     stdout=StringIO())
+        self.assertRaises(AuthenticationFailed,
+                          self.auth.authenticate_credentials, self.token.key)
+
+        token = Token.objects.get(user=self.user)
+        user, _ = self.auth.authenticate_credentials(token.key)
+        self.assertEqual(user, self.user)
+
+    def test_user_inactive(self):
+        self.auth.authenticate_credentials(self.token.key)
+        self.user.is_active = False
+        self.user.save()
+        self.assertIsNone(cache.get(token_cache_key(self.token.key)))
+        self.assertRaises(AuthenticationFailed,
+                          self.auth.authenticate_credentials, self.token.key)
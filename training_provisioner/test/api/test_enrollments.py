@@ -3,7 +3,11 @@
 
 from training_provisioner.test import TrainingCourseTestCase
 from training_provisioner.models.training_course import TrainingCourse
-from training_provisioner.views.api.enrollments import Enrollments
+from training_provisioner.views.api.enrollments import (
+    Enrollments, StudentEnrollments, TrainingCourseEnrollments)
+from training_provisioner.models import Import
+from training_provisioner.models.enrollment import Enrollment
+import csv
 from django.test.client import RequestFactory
 from django.urls import reverse_lazy
 import json
@@ -29,3 +33,140 @@ class EnrollmentsAPITest(TrainingCourseTestCase):
         # They are excluded from AY2026-2027-101 due to having previous 101
         #    enrollment
         self.assertEqual(len(enrollments), 2)
+
+    def test_get_enrollments_queries(self):
+        for training_course in TrainingCourse.objects.active_courses():
+            training_course.load_courses_and_enrollments()
+
+        enrollments_api = Enrollments()
+        url = reverse_lazy('student_enrollments',
+                           kwargs={'integration_id': '5432101'})
+        request = RequestFactory().get(url)
+        with self.assertNumQueries(1):
+            response = enrollments_api.get(request, integration_id='5432101')
+
+        for enrollment in json.loads(response.content):
+            if enrollment['section'] is not None:
+                self.assertEqual(enrollment['section']['course'],
+                                 enrollment['course'])
+
+    def test_get_enrollments_cached(self):
+        for training_course in TrainingCourse.objects.active_courses():
+            training_course.load_courses_and_enrollments()
+
+        enrollments_api = Enrollments()
+        url = reverse_lazy('student_enrollments',
+                           kwargs={'integration_id': '5432101'})
+        response = enrollments_api.get(
+            RequestFactory().get(url), integration_id='5432101')
+        etag = response['ETag']
+
+        with self.assertNumQueries(0):
+            cached = enrollments_api.get(
+                RequestFactory().get(url), integration_id='5432101')
+        self.assertEqual(cached.content, response.content)
+        self.assertEqual(cached['ETag'], etag)
+
+        with self.assertNumQueries(0):
+            response = enrollments_api.get(
+                RequestFactory().get(url, HTTP_IF_NONE_MATCH=etag),
+                integration_id='5432101')
+        self.assertEqual(response.status_code, 304)
+
+        # other students' changes leave the response cached
+        Enrollment.objects.filter(integration_id='5432102').first().save()
+        response = enrollments_api.get(
+            RequestFactory().get(url, HTTP_IF_NONE_MATCH=etag),
+            integration_id='5432101')
+        self.assertEqual(response.status_code, 304)
+
+        enrollment = Enrollment.objects.filter(
+            integration_id='5432101').first()
+        enrollment.save()
+        response = enrollments_api.get(
+            RequestFactory().get(url, HTTP_IF_NONE_MATCH=etag),
+            integration_id='5432101')
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+        # queryset updates invalidate every student
+        etag = response['ETag']
+        Import(pk=1).dequeue_dependent_models()
+        response = enrollments_api.get(
+            RequestFactory().get(url, HTTP_IF_NONE_MATCH=etag),
+            integration_id='5432101')
+        self.assertEqual(response.status_code, 200)
+
+    def test_post_student_enrollments(self):
+        for training_course in TrainingCourse.objects.active_courses():
+            training_course.load_courses_and_enrollments()
+
+        students_api = StudentEnrollments()
+        url = reverse_lazy('students_enrollments')
+        integration_ids = ['5432101', '5432102', '9999999']
+        request = RequestFactory().post(
+            url, json.dumps({'integration_ids': integration_ids}),
+            content_type='application/json')
+
+        with self.assertNumQueries(1):
+            response = students_api.post(request)
+            students = json.loads(b''.join(response.streaming_content))
+
+        self.assertEqual(list(students.keys()), integration_ids)
+        self.assertEqual(len(students['5432101']), 2)
+        self.assertEqual(students['9999999'], [])
+
+        single = json.loads(Enrollments().get(
+            RequestFactory().get('/'), integration_id='5432102').content)
+        self.assertEqual(students['5432102'], single)
+
+        for body in ['[]', '{"integration_ids": "5432101"}',
+                     '{"integration_ids": ["abc"]}']:
+            response = students_api.post(RequestFactory().post(
+                url, body, content_type='application/json'))
+            self.assertEqual(response.status_code, 400)
+
+        with self.settings(STUDENT_ENROLLMENTS_MAX_IDS=2):
+            response = students_api.post(request)
+            self.assertEqual(response.status_code, 400)
+
+    def test_get_training_course_enrollments(self):
+        for training_course in TrainingCourse.objects.active_courses():
+            training_course.load_courses_and_enrollments()
+
+        training_course = TrainingCourse.objects.active_courses().first()
+        enrollments = Enrollment.objects.filter(
+            course__training_course=training_course).order_by('pk')
+        roster_api = TrainingCourseEnrollments()
+        url = reverse_lazy('training_course_enrollments', kwargs={
+            'training_course_id': training_course.pk})
+
+        response = roster_api.get(
+            RequestFactory().get(url), training_course_id=training_course.pk)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        rows = [json.loads(line) for line in b''.join(
+            response.streaming_content).decode().splitlines()]
+        self.assertEqual(len(rows), enrollments.count())
+        self.assertEqual(rows[0]['integration_id'],
+                         enrollments[0].integration_id)
+        self.assertEqual(rows[0]['course_id'],
+                         enrollments[0].course.course_id)
+        self.assertTrue(rows[0]['is_active'])
+
+        response = roster_api.get(
+            RequestFactory().get(url, {'output': 'csv'}),
+            training_course_id=training_course.pk)
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        rows = list(csv.reader(b''.join(
+            response.streaming_content).decode().splitlines()))
+        self.assertEqual(rows[0], TrainingCourseEnrollments.HEADER)
+        self.assertEqual(len(rows), enrollments.count() + 1)
+
+        response = roster_api.get(
+            RequestFactory().get(url, {'output': 'xml'}),
+            training_course_id=training_course.pk)
+        self.assertEqual(response.status_code, 400)
+
+        response = roster_api.get(
+            RequestFactory().get(url), training_course_id=9999)
+        self.assertEqual(response.status_code, 404)
@@ -8,6 +8,7 @@ from django.test.client import RequestFactory
 from django.urls import reverse_lazy
 from django.contrib.auth.models import AnonymousUser
 from prometheus_client import REGISTRY
+from unittest import mock
 import json
 
 
@@ -29,6 +30,79 @@ class ImportsAPITest(TrainingCourseTestCase):
 
         self.assertEqual(len(imports.get('imports')), 1)
 
+    def test_get_imports_paged(self):
+        import_list_api = ImportListView()
+        url = reverse_lazy('import_list')
+        for i in range(5):
+            Import.objects.create(
+                csv_type='course' if i % 2 else 'enrollment',
+                canvas_state='imported', canvas_errors='[]' * 1000)
+
+        pages = []
+        params = {'limit': 2}
+        while True:
+            response = import_list_api.get(RequestFactory().get(url, params))
+            data = json.loads(response.content)
+            pages.append([imp['queue_id'] for imp in data['imports']])
+            if not data['next']:
+                break
+            params['cursor'] = data['next']
+
+        self.assertEqual([len(page) for page in pages], [2, 2, 1])
+        self.assertEqual(sum(pages, []), list(
+            Import.objects.order_by('added_date', 'pk').values_list(
+                'pk', flat=True)))
+        self.assertNotIn('canvas_errors', data['imports'][0])
+
+        # a cursor without a limit pages by DEFAULT_LIMIT
+        with mock.patch.object(ImportListView, 'DEFAULT_LIMIT', 3):
+            response = import_list_api.get(RequestFactory().get(url, {
+                'cursor': import_list_api.encode_cursor(
+                    Import.objects.get(pk=pages[0][0]))}))
+        data = json.loads(response.content)
+        self.assertEqual([imp['queue_id'] for imp in data['imports']],
+                         pages[0][1:] + pages[1])
+        self.assertIsNotNone(data['next'])
+
+        response = import_list_api.get(RequestFactory().get(url, {
+            'csv_type': 'course', 'fields': 'canvas_errors'}))
+        imports = json.loads(response.content)['imports']
+        self.assertEqual(len(imports), 2)
+        self.assertEqual(imports[0]['canvas_errors'], '[]' * 1000)
+
+        response = import_list_api.get(RequestFactory().get(url, {
+            'state': 'imported,failed', 'priority': 1,
+            'added_after': '2020-01-01T00:00:00Z'}))
+        self.assertEqual(len(json.loads(response.content)['imports']), 5)
+
+        response = import_list_api.get(RequestFactory().get(url, {
+            'added_before': '2020-01-01T00:00:00Z'}))
+        self.assertEqual(len(json.loads(response.content)['imports']), 0)
+
+        for params in [{'cursor': 'abc'}, {'limit': 'x'},
+                       {'added_after': 'yesterday'}]:
+            response = import_list_api.get(RequestFactory().get(url, params))
+            self.assertEqual(response.status_code, 400)
+
+    def test_get_imports_queries(self):
+        import_list_api = ImportListView()
+        url = reverse_lazy('import_list')
+        for i in range(10):
+            Import.objects.create(csv_type='course', canvas_errors='[]')
+
+        # deferred text columns are never loaded, and without a limit
+        # or cursor every import is returned
+        with mock.patch.object(ImportListView, 'DEFAULT_LIMIT', 5), \
+                self.assertNumQueries(1):
+            response = import_list_api.get(RequestFactory().get(url))
+        self.assertEqual(len(json.loads(response.content)['imports']), 10)
+
+        with self.assertNumQueries(1):
+            response = import_list_api.get(RequestFactory().get(url, {
+                'fields': 'canvas_errors'}))
+        self.assertEqual(json.loads(
+            response.content)['imports'][0]['canvas_errors'], '[]')
+
     def test_get_import(self):
         _ = Import.objects.create(
             csv_type='course', canvas_id='1')
@@ -53,3 +53,101 @@ class CourseBuilderTest(TrainingCourseTestCase):
             csv_data = f.readlines()
 
         self.assertEqual(len(csv_data) - 1, enrollments.count())
+
+    @override_settings(
+        TRAINING_IMPORT_CSV_DEBUG=False,
+        STORAGES={
+            "default": {
+                "BACKEND": "django.core.files.storage.memory.InMemoryStorage",
+            },
+        }
+    )
+    def test_course_builder_shards(self):
+        self.call_load_training_courses()
+
+        imp = Course.objects.queue_by_priority(Course.PRIORITY_DEFAULT)
+        course_count = imp.queued_objects().count()
+
+        shards = []
+        builder = CourseBuilder(
+            imp.queued_objects(), max_rows=5, on_shard=shards.append)
+        imp.csv_path = builder.build()
+
+        self.assertGreater(len(shards), 1)
+        self.assertEqual(
+            sum([shard.queued_objects().count() for shard in shards]) +
+            imp.queued_objects().count(), course_count)
+
+        for shard in shards:
+            self.assertIsNotNone(shard.csv_path)
+            self.assertEqual(shard.priority, imp.priority)
+
+        # a course's rows are never split across imports
+        for course in Course.objects.all():
+            self.assertEqual(
+                set(Section.objects.filter(course=course).values_list(
+                    'queue_id', flat=True)) - {course.queue_id}, set())
+            self.assertEqual(
+                set(Enrollment.objects.filter(course=course).values_list(
+                    'queue_id', flat=True)) - {course.queue_id}, set())
+
+        enrollment_rows = 0
+        for csv_path in [s.csv_path for s in shards] + [imp.csv_path]:
+            if csv_path is None:
+                continue
+            filename = os.path.join(csv_path, 'enrollments.csv')
+            if default_storage.exists(filename):
+                with default_storage.open(filename, mode='r') as f:
+                    enrollment_rows += len(f.readlines()) - 1
+
+        self.assertEqual(enrollment_rows, Enrollment.objects.count())
+
+    @override_settings(
+        TRAINING_IMPORT_CSV_DEBUG=False,
+        STORAGES={
+            "default": {
+                "BACKEND": "django.core.files.storage.memory.InMemoryStorage",
+            },
+        }
+    )
+    def test_course_builder_shard_pages(self):
+        self.call_load_training_courses()
+
+        imp = Course.objects.queue_by_priority(Course.PRIORITY_DEFAULT)
+
+        # rows are moved to shards between the pages that read them
+        shards = []
+        builder = CourseBuilder(
+            imp.queued_objects(), max_rows=5, on_shard=shards.append)
+        builder.CHUNK_SIZE = 2
+        imp.csv_path = builder.build()
+
+        enrollment_rows = 0
+        for csv_path in [s.csv_path for s in shards] + [imp.csv_path]:
+            if csv_path is None:
+                continue
+            filename = os.path.join(csv_path, 'enrollments.csv')
+            if default_storage.exists(filename):
+                with default_storage.open(filename, mode='r') as f:
+                    enrollment_rows += len(f.readlines()) - 1
+
+        self.assertEqual(enrollment_rows, Enrollment.objects.count())
+
+    def test_course_builder_queries(self):
+        self.call_load_training_courses()
+
+        imp = Course.objects.queue_by_priority(Course.PRIORITY_DEFAULT)
+        self.assertGreater(Enrollment.objects.count(), 5)
+
+        # courses, then a claim and a select each for sections and
+        # enrollments, however many rows are queued
+        builder = CourseBuilder(imp.queued_objects())
+        with self.assertNumQueries(5):
+            builder.build()
+
+        self.assertEqual(
+            Enrollment.objects.filter(queue_id=imp.pk).count(),
+            Enrollment.objects.count())
+        self.assertEqual(
+            Section.objects.filter(queue_id=imp.pk).count(),
+            Section.objects.count())
@@ -0,0 +1,52 @@
+# Copyright 2026 UW-IT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+from django.utils.timezone import localtime
+from training_provisioner.test import TrainingCourseTestCase
+from training_provisioner.models.enrollment import (
+    Enrollment, EnrollmentHistoryEvent)
+import os
+import tempfile
+
+
+class AuditEnrollmentHistoryTest(TrainingCourseTestCase):
+    def setUp(self):
+        self.call_load_training_courses()
+        self.enrollments = list(Enrollment.objects.order_by('pk')[:3])
+
+    def test_audit_passed(self):
+        with self.assertNumQueries(4):
+            out = self._call_command('audit_enrollment_history')
+        self.assertIn('No issues found', out)
+
+    def test_audit_problems(self):
+        no_history, missing_created, inconsistent = self.enrollments
+        no_history.history_events.all().delete()
+        missing_created.history_events.update(
+            event_type=EnrollmentHistoryEvent.EVENT_TYPE_UPDATED)
+        Enrollment.objects.filter(pk=inconsistent.pk).update(
+            deleted_date=localtime())
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            output_file = os.path.join(tmpdir, 'problems.csv')
+            out = self._call_command(
+                'audit_enrollment_history', verbose=True,
+                output_file=output_file)
+            with open(output_file) as f:
+                problems = f.read().splitlines()
+
+        self.assertIn('1 enrollments have no history events', out)
+        self.assertIn('1 enrollments missing CREATED event', out)
+        self.assertIn('1 enrollments have inconsistent deletion state', out)
+        self.assertIn(f'   - {no_history.integration_id} in '
+                      f'{no_history.course.course_id}', out)
+        self.assertIn('Found 3 issues', out)
+        self.assertEqual(sorted(problems), sorted([
+            f'no_history,{no_history.pk},{no_history.integration_id},'
+            f'{no_history.course.course_id}',
+            f'missing_created,{missing_created.pk},'
+            f'{missing_created.integration_id},'
+            f'{missing_created.course.course_id}',
+            f'inconsistent_state,{inconsistent.pk},'
+            f'{inconsistent.integration_id},{inconsistent.course.course_id}',
+        ]))
@@ -0,0 +1,43 @@
+# Copyright 2026 UW-IT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from training_provisioner.test import TrainingCourseTestCase
+from training_provisioner.models.enrollment import (
+    Enrollment, EnrollmentHistoryEvent)
+
+
+class BackfillEnrollmentHistoryTest(TrainingCourseTestCase):
+    def setUp(self):
+        self.call_load_training_courses()
+        EnrollmentHistoryEvent.objects.all().delete()
+
+    def test_backfill(self):
+        count = Enrollment.objects.count()
+        self.assertGreater(count, 2)
+
+        out = self._call_command('backfill_enrollment_history', dry_run=True)
+        self.assertIn(f'DRY RUN: Would create {count} history events', out)
+        self.assertEqual(EnrollmentHistoryEvent.objects.count(), 0)
+
+        with CaptureQueriesContext(connection) as queries:
+            out = self._call_command(
+                'backfill_enrollment_history', batch_size=count - 1)
+
+        # the count, two chunks of two queries each, then an empty chunk
+        self.assertEqual(len([q for q in queries if not q['sql'].startswith(
+            ('SAVEPOINT', 'RELEASE SAVEPOINT'))]), 1 + 2 * 2 + 1)
+        self.assertIn(f'Successfully created {count} history events', out)
+
+        for enrollment in Enrollment.objects.all():
+            event = enrollment.history_events.get()
+            self.assertEqual(event.event_type,
+                             EnrollmentHistoryEvent.EVENT_TYPE_CREATED)
+            self.assertEqual(event.timestamp, enrollment.created_date)
+            self.assertEqual(event.course_id, enrollment.course.course_id)
+            self.assertEqual(event.section_id, (
+                enrollment.section.section_id if enrollment.section else None))
+
+        out = self._call_command('backfill_enrollment_history')
+        self.assertIn('No enrollments need history backfilling', out)
@@ -0,0 +1,74 @@
+# Copyright 2026 UW-IT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+from training_provisioner.test import TrainingCourseTestCase
+from training_provisioner.models.training_course import TrainingCourse
+from training_provisioner.models.course import Course
+from uw_canvas.models import CanvasCourse
+from unittest import mock
+
+
+def canvas_course(course_id, workflow_state):
+    course = CanvasCourse()
+    course.course_id = course_id
+    course.workflow_state = workflow_state
+    return course
+
+
+@mock.patch('training_provisioner.management.commands.publish_courses.'
+            'publish_course')
+@mock.patch('training_provisioner.management.commands.publish_courses.'
+            'get_course_by_sis_id')
+class PublishCoursesTest(TrainingCourseTestCase):
+    def setUp(self):
+        self.call_load_training_courses()
+        self.training_course = TrainingCourse.objects.filter(
+            course_count__gt=1).first()
+        self.courses = list(Course.objects.get_models_for_training_course(
+            self.training_course).order_by('pk'))
+
+    def publish_courses(self, **kwargs):
+        return self._call_command(
+            'publish_courses', training_course_blueprint_sis_id=(
+                self.training_course.blueprint_course_id), **kwargs)
+
+    def test_publish_courses(self, mock_get_course, mock_publish):
+        already = self.courses[0].course_id
+        mock_get_course.side_effect = lambda sis_id: canvas_course(
+            sis_id, 'available' if sis_id == already else 'unpublished')
+        mock_publish.side_effect = lambda course_id: canvas_course(
+            course_id, 'available')
+
+        out = self.publish_courses(workers=4)
+
+        self.assertEqual(mock_publish.call_count, len(self.courses) - 1)
+        self.assertIn(f"Success: {len(self.courses) - 1}, Skipped: 1, "
+                      "Failed: 0", out)
+        self.assertEqual(Course.objects.filter(
+            training_course=self.training_course,
+            published_status='available',
+            published_date__isnull=False).count(), len(self.courses))
+
+    def test_publish_courses_resume(self, mock_get_course, mock_publish):
+        failed = self.courses[-1].course_id
+        mock_get_course.side_effect = lambda sis_id: canvas_course(
+            sis_id, 'unpublished')
+
+        def publish(course_id):
+            if course_id == failed:
+                raise Exception('Rate Limit Exceeded')
+            return canvas_course(course_id, 'available')
+
+        mock_publish.side_effect = publish
+
+        out = self.publish_courses(workers=2)
+        self.assertIn("Failed: 1", out)
+
+        mock_get_course.reset_mock()
+        mock_publish.side_effect = lambda course_id: canvas_course(
+            course_id, 'available')
+
+        out = self.publish_courses(resume=True)
+        mock_get_course.assert_called_once_with(failed)
+        self.assertIn(
+            f"Success: 1, Skipped: {len(self.courses) - 1}, Failed: 0", out)
@@ -0,0 +1,123 @@
+# Copyright 2026 UW-IT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+from training_provisioner.test import TrainingCourseTestCase
+from training_provisioner.management.commands.reload_enrollment_errors import (
+    Command)
+from training_provisioner.models import Import
+from training_provisioner.models.import_message import ImportMessage
+from training_provisioner.models.course import Course
+from training_provisioner.models.enrollment import Enrollment
+from django.test import override_settings
+from django.utils.timezone import localtime
+from training_provisioner.dao.canvas import get_import_error_pages
+from uw_canvas.models import SISImportError
+from unittest import mock
+
+
+def sis_error(course_id, integration_id):
+    return SISImportError(data={
+        'sis_import_id': 1,
+        'file': 'enrollments.csv',
+        'message': (f"User not found for enrollment (User ID: , "
+                    f"Course ID: {course_id}, Section ID: )"),
+        'row_info': (f'[{{course_id: "{course_id}", section_id: nil, '
+                     f'user_id: nil, user_integration_id: '
+                     f'"{integration_id}", role: "student"}}]'),
+        'row': 1})
+
+
+class ReloadEnrollmentErrorsTest(TrainingCourseTestCase):
+    def _provisioned_enrollments(self, mock_errors):
+        self.call_load_training_courses()
+        Course.objects.update(priority=Course.PRIORITY_NONE)
+        Enrollment.objects.update(
+            priority=Enrollment.PRIORITY_NONE, provisioned_date=localtime())
+
+        enrollments = list(Enrollment.objects.select_related(
+            'course').order_by('pk')[:3])
+        mock_errors.return_value = [[
+            sis_error(e.course.course_id, e.integration_id)
+            for e in enrollments], [
+                sis_error(enrollments[0].course.course_id, '0000000')]]
+        return enrollments
+
+    def _assert_prioritized(self, enrollments):
+        self.assertEqual(set(Enrollment.objects.filter(
+            provisioned_date__isnull=True,
+            priority=Enrollment.PRIORITY_DEFAULT)), set(enrollments))
+        self.assertEqual(set(Course.objects.filter(
+            priority=Course.PRIORITY_DEFAULT)), set(
+                [e.course for e in enrollments]))
+
+    @mock.patch('training_provisioner.management.commands.'
+                'reload_enrollment_errors.get_import_error_pages')
+    def test_process_enrollment_errors(self, mock_errors):
+        enrollments = self._provisioned_enrollments(mock_errors)
+        imp = Import.objects.create(csv_type='course', canvas_id='1')
+        imp.add_messages([['enrollments.csv', 'warning']], [])
+
+        with self.assertNumQueries(7):
+            Command().process_enrollment_errors(mock.Mock(import_id=1))
+
+        self.assertEqual(ImportMessage.objects.users_not_found('1').filter(
+            integration_id__in=[e.integration_id for e in enrollments]
+        ).count(), len(enrollments))
+        self.assertEqual(imp.messages.filter(
+            integration_id='0000000').count(), 1)
+        self._assert_prioritized(enrollments)
+
+        # reloading replaces the errors, but not processing messages
+        Command().process_enrollment_errors(mock.Mock(import_id=1))
+        self.assertEqual(imp.messages.count(), len(enrollments) + 2)
+        self.assertEqual(imp.reported_messages('enrollments.csv'),
+                         ['warning'])
+
+    @mock.patch('training_provisioner.management.commands.'
+                'reload_enrollment_errors.get_import_error_pages')
+    def test_process_enrollment_errors_no_import(self, mock_errors):
+        enrollments = self._provisioned_enrollments(mock_errors)
+
+        Command().process_enrollment_errors(mock.Mock(import_id=1))
+
+        self._assert_prioritized(enrollments)
+        self.assertEqual(ImportMessage.objects.count(), 0)
+
+    def test_sis_error_without_row(self):
+        error = sis_error('course', '1234567')
+        error.row = None
+        imp = Import.objects.create(csv_type='course', canvas_id='1')
+        ImportMessage.objects.add_import_errors(imp, [error])
+
+        # row-less SIS errors aren't processing messages
+        self.assertEqual(
+            ImportMessage.objects.users_not_found('1').count(), 1)
+        self.assertEqual(imp.reported_messages('enrollments.csv'), [])
+
+    @override_settings(RESTCLIENTS_CANVAS_ACCOUNT_ID='12345')
+    def test_get_import_by_id(self):
+        sis_import = Command().get_import_by_id(1)
+        self.assertEqual(sis_import.import_id, 1)
+
+        self.assertIsNone(Command().get_import_by_id(2))
+
+    @override_settings(RESTCLIENTS_CANVAS_ACCOUNT_ID='12345')
+    def test_get_import_error_pages(self):
+        sis_import = Command().get_import_by_id(1)
+        pages = list(get_import_error_pages(sis_import))
+        self.assertEqual([len(page) for page in pages], [2, 1])
+        self.assertEqual(pages[0][0].import_file, 'enrollments.csv')
+
+        message = ImportMessage.from_sis_error(
+            Import(csv_type='course'), pages[0][0])
+        self.assertEqual(message.message_class, 'user_not_found')
+        self.assertEqual(message.course_id,
+                         'AY2025-2026-101-BLUEPRINT_354-009')
+        self.assertEqual(message.integration_id, '9876543')
+        self.assertEqual(message.row, 601)
+
+        message = ImportMessage.from_sis_error(
+            Import(csv_type='course'), pages[1][0])
+        self.assertEqual(message.message_class, 'course_not_found')
+        self.assertEqual(message.section_id,
+                         'AY2025-2026-101-BLUEPRINT_354-012-A-')
@@ -35,3 +35,23 @@ class CSVDataTest(TrainingCourseTestCase):
             path = csv.write_files()
             mock_open.assert_called_with(path + '/enrollments.csv', mode='w')
             self.assertEqual(csv.has_data(), False)
+
+    def test_is_full(self):
+        csv = Collector()
+        csv.add(CourseCSV(course_id='ABC', short_name='abc', long_name='abc',
+                          account_id='1', term_id='2'))
+        self.assertEqual(csv.row_count, 1)
+        self.assertEqual(csv.is_full(), False)
+
+        csv = Collector(max_rows=2)
+        csv.add(SectionCSV(section_id='ABC-A-', course_id='ABC', name='A'))
+        self.assertEqual(csv.is_full(), False)
+        csv.add(SectionCSV(section_id='ABC-A-', course_id='ABC', name='A'))
+        self.assertEqual(csv.row_count, 1)
+        csv.add(SectionCSV(section_id='ABC-B-', course_id='ABC', name='B'))
+        self.assertEqual(csv.is_full(), True)
+
+        csv = Collector(max_bytes=10)
+        csv.add(SectionCSV(section_id='ABC-A-', course_id='ABC', name='A'))
+        self.assertEqual(csv.byte_count, len('ABC-A-,ABC,A,active\n'))
+        self.assertEqual(csv.is_full(), True)
@@ -3,7 +3,9 @@
 
 from django.test import TestCase
 from training_provisioner.dao.canvas import *
+from uw_canvas.dao import Canvas_DAO
 from unittest.mock import ANY
+from threading import Thread
 import mock
 
 
@@ -72,3 +74,64 @@ class CanvasAuthSettingsTest(TestCase):
     def test_get_auth_settings(self, mock_method, mock_model):
         auth_settings = update_auth_settings(mock_model)
         mock_method.assert_called_with('123', mock_model)
+
+
+class CanvasRateLimitTest(TestCase):
+    def test_shared_client(self):
+        self.assertIs(canvas_client(Courses), canvas_client(Courses))
+
+        with self.settings(RESTCLIENTS_CANVAS_ACCOUNT_ID='12345'):
+            client = canvas_client(PagedSISImport)
+            self.assertEqual(client._canvas_account_id, '12345')
+        self.assertIsNot(canvas_client(PagedSISImport), client)
+
+    def test_client_per_thread(self):
+        clients = []
+        thread = Thread(target=lambda: clients.append(canvas_client(Courses)))
+        thread.start()
+        thread.join()
+
+        self.assertIsNot(clients[0], canvas_client(Courses))
+
+    @mock.patch('training_provisioner.dao.canvas.time.monotonic')
+    def test_rate_limit_delay(self, mock_monotonic):
+        mock_monotonic.return_value = 100.0
+        rate_limit = CanvasRateLimit(
+            threshold=100, refill_rate=10, max_delay=10)
+        self.assertEqual(rate_limit.delay(), 0)
+
+        rate_limit.update('600.0', '1.5')
+        self.assertEqual(rate_limit.delay(), 0)
+        self.assertEqual(rate_limit.remaining, 598.5)
+
+        # below threshold, wait for the bucket to refill
+        rate_limit.update('50', '10')
+        self.assertEqual(rate_limit.delay(), 5)
+
+        # concurrent callers queue behind the reserved budget
+        self.assertEqual(rate_limit.delay(), 6)
+
+        rate_limit.update('0')
+        self.assertEqual(rate_limit.delay(), 10)
+
+    @mock.patch.object(LiveDAO, 'load')
+    @mock.patch('training_provisioner.dao.canvas.canvas_rate_limit')
+    def test_rate_limited_dao(self, mock_rate_limit, mock_load):
+        mock_load.return_value = mock.Mock(status=200, headers={
+            'x-rate-limit-remaining': '412.5', 'X-Request-Cost': '2.1'})
+
+        with self.settings(RESTCLIENTS_CANVAS_DAO_CLASS=(
+                'training_provisioner.dao.canvas.RateLimitedLiveDAO')):
+            dao = Canvas_DAO().get_implementation()
+
+        self.assertIsInstance(dao, RateLimitedLiveDAO)
+        response = dao.load('GET', '/api/v1/courses', {}, None)
+        self.assertIs(response, mock_load.return_value)
+        mock_rate_limit.throttle.assert_called_once()
+        mock_rate_limit.update.assert_called_with('412.5', '2.1')
+
+    @mock.patch('training_provisioner.dao.canvas.canvas_rate_limit')
+    def test_mock_responses_not_throttled(self, mock_rate_limit):
+        get_course_by_sis_id('BLUEPRINT_123', {'include': ['term']})
+        mock_rate_limit.throttle.assert_not_called()
+        mock_rate_limit.update.assert_not_called()
@@ -1,10 +1,14 @@
 # Copyright 2026 UW-IT, University of Washington
 # SPDX-License-Identifier: Apache-2.0
 
+from django.db import connections, transaction
+from django.test import TransactionTestCase, skipUnlessDBFeature
 from training_provisioner.test import TrainingCourseTestCase
-from training_provisioner.models import ImportResource
+from training_provisioner.models import Import, ImportResource
 from training_provisioner.models.training_course import TrainingCourse
 from training_provisioner.models.course import Course
+from training_provisioner.exceptions import EmptyQueueException
+from threading import Thread
 
 
 class CourseModelTest(TrainingCourseTestCase):
@@ -36,3 +40,69 @@ class CourseModelTest(TrainingCourseTestCase):
             ImportResource.PRIORITY_DEFAULT)
 
         self.assertEqual(imp.queued_objects().count(), total_courses)
+
+    def test_course_model_claim(self):
+        for training_course in TrainingCourse.objects.active_courses():
+            Course.objects.add_models_for_training_course(training_course)
+
+        imp = Course.objects.queue_by_priority(
+            ImportResource.PRIORITY_DEFAULT)
+
+        self.assertRaises(
+            EmptyQueueException, Course.objects.queue_by_priority,
+            ImportResource.PRIORITY_DEFAULT)
+        self.assertEqual(Import.objects.count(), 1)
+
+        self.assertEqual(Course.objects.claim(
+            'abc', priority=ImportResource.PRIORITY_DEFAULT), 0)
+        self.assertEqual(Course.objects.filter(
+            queue_id=imp.pk).count(), Course.objects.count())
+
+    def test_course_model_queue_partition(self):
+        for training_course in TrainingCourse.objects.active_courses():
+            Course.objects.add_models_for_training_course(training_course)
+
+        imports = [Course.objects.queue_by_priority(
+            ImportResource.PRIORITY_DEFAULT, (index, 2))
+            for index in range(2)]
+
+        queued = [set(Course.objects.queued(imp.pk).values_list(
+            'pk', flat=True)) for imp in imports]
+
+        self.assertTrue(len(queued[0]) and len(queued[1]))
+        self.assertFalse(queued[0] & queued[1])
+        self.assertEqual(queued[0] | queued[1], set(
+            Course.objects.values_list('pk', flat=True)))
+        self.assertTrue(all(pk % 2 == 0 for pk in queued[0]))
+
+
+@skipUnlessDBFeature('has_select_for_update_skip_locked')
+class CourseQueueConcurrencyTest(TransactionTestCase):
+    fixtures = ['test_data/training_course.json']
+
+    def test_course_model_concurrent_claim(self):
+        for training_course in TrainingCourse.objects.active_courses():
+            Course.objects.add_models_for_training_course(training_course)
+
+        locked = list(Course.objects.order_by('pk').values_list(
+            'pk', flat=True)[:3])
+        claimed = []
+
+        def concurrent_claim():
+            try:
+                claimed.append(Course.objects.claim(
+                    'worker', priority=ImportResource.PRIORITY_DEFAULT))
+            finally:
+                connections.close_all()
+
+        # rows locked by an in-flight claim are skipped, not waited on
+        with transaction.atomic():
+            list(Course.objects.filter(
+                pk__in=locked).select_for_update())
+            worker = Thread(target=concurrent_claim)
+            worker.start()
+            worker.join()
+
+        self.assertEqual(claimed, [Course.objects.count() - len(locked)])
+        self.assertEqual(Course.objects.filter(
+            pk__in=locked, queue_id__isnull=True).count(), len(locked))
@@ -5,9 +5,11 @@ from training_provisioner.test import TrainingCourseTestCase
 from training_provisioner.models.training_course import TrainingCourse
 from training_provisioner.models.course import Course
 from training_provisioner.models.section import Section
-from training_provisioner.models.enrollment import Enrollment
+from training_provisioner.models.enrollment import (
+    Enrollment, EnrollmentHistoryEvent)
 from training_provisioner.exceptions import (EnrollmentCourseMismatch,
                                              DataAccessException)
+from django.utils.timezone import localtime
 from mock import patch
 
 
@@ -121,6 +123,22 @@ class EnrollmentModelTest(TrainingCourseTestCase):
             Enrollment.objects._add_enrollment(
                 integration_id, self.training_course)
 
+    def test_add_enrollment_course_models(self):
+        integration_id = '5432101'
+        enrollment = Enrollment.objects.get(integration_id=integration_id)
+        assignment = (enrollment.course.course_id,
+                      enrollment.section.section_id if (
+                          enrollment.section) else None)
+        course_models = Enrollment.objects._course_models(
+            self.training_course)
+
+        # only the student's enrollment is read
+        with self.assertNumQueries(1):
+            self.assertEqual(Enrollment.objects._add_enrollment(
+                integration_id, self.training_course,
+                enrollment.eligible_terms, assignment, course_models),
+                enrollment)
+
     def test_enrollment_section_change(self):
         training_course = TrainingCourse.objects.get(pk=2)
 
@@ -204,3 +222,45 @@ class EnrollmentModelTest(TrainingCourseTestCase):
         self.assertIn("No membership candidates found", str(context.exception))
         self.assertIn("existing enrollments present", str(context.exception))
         self.assertIn("membership retrieval failure", str(context.exception))
+
+    def test_enrollment_requeue(self):
+        Enrollment.objects.update(provisioned_date=localtime(), priority=0)
+        Course.objects.update(priority=Course.PRIORITY_NONE)
+        enrollments = Enrollment.objects.filter(
+            course__training_course=self.training_course)
+        count = enrollments.count()
+
+        with self.assertNumQueries(4):
+            self.assertEqual(Enrollment.objects.requeue(enrollments), count)
+
+        self.assertFalse(enrollments.filter(
+            provisioned_date__isnull=False).exists())
+        self.assertEqual(EnrollmentHistoryEvent.objects.filter(
+            event_type=EnrollmentHistoryEvent.EVENT_TYPE_REQUEUED).count(),
+            count)
+        self.assertFalse(Course.objects.filter(
+            enrollment__in=enrollments,
+            priority=Course.PRIORITY_NONE).exists())
+
+        Enrollment.objects.requeue(
+            enrollments.filter(integration_id='5432101'),
+            priority=Enrollment.PRIORITY_IMMEDIATE)
+        enrollment = Enrollment.objects.get(integration_id='5432101')
+        self.assertEqual(enrollment.priority, Enrollment.PRIORITY_IMMEDIATE)
+        self.assertEqual(enrollment.course.priority,
+                         Course.PRIORITY_IMMEDIATE)
+
+    def test_enrollment_mark_deleted(self):
+        enrollments = Enrollment.objects.filter(
+            integration_id__in=['5432101', '5432102'])
+        Enrollment.objects.mark_deleted(enrollments)
+
+        for enrollment in enrollments:
+            self.assertIsNotNone(enrollment.deleted_date)
+            self.assertEqual(enrollment.history_events.first().event_type,
+                             EnrollmentHistoryEvent.EVENT_TYPE_DELETED)
+
+        # already deleted enrollments are left alone
+        self.assertEqual(Enrollment.objects.mark_deleted(enrollments), 0)
+        self.assertEqual(EnrollmentHistoryEvent.objects.filter(
+            event_type=EnrollmentHistoryEvent.EVENT_TYPE_DELETED).count(), 2)
@@ -3,8 +3,15 @@
 
 from training_provisioner.test import TrainingCourseTestCase
 from training_provisioner.models import Import
+from training_provisioner.models.course import Course
+from training_provisioner.models.section import Section
+from training_provisioner.models.enrollment import Enrollment
+from training_provisioner.models.import_message import ImportMessage
+from training_provisioner.builders.courses import CourseBuilder
 from django.test import override_settings
 from prometheus_client import REGISTRY
+from datetime import datetime, timedelta, timezone
+import json
 
 
 class ImportsAPITest(TrainingCourseTestCase):
@@ -27,3 +34,178 @@ class ImportsAPITest(TrainingCourseTestCase):
 
         self.assertEqual(1, warn_after - warn_before)
         self.assertEqual(1, error_after - error_before)
+
+    @override_settings(RESTCLIENTS_CANVAS_ACCOUNT_ID='12345')
+    def test_monitor_imports(self):
+        polled = Import.objects.create(
+            csv_type='course', canvas_id='1', post_status=200)
+        missing = Import.objects.create(
+            csv_type='course', canvas_id='2', post_status=200)
+
+        self._call_command('monitor_imports', workers=2)
+
+        polled = Import.objects.get(pk=polled.pk)
+        self.assertEqual(polled.monitor_status, 200)
+        self.assertGreater(polled.monitor_next_date, polled.monitor_date)
+        self.assertEqual(list(polled.messages.order_by('pk').values_list(
+            'message_type', 'csv_file')), [
+                ('warning', 'students.csv'), ('error', 'students.csv')])
+        self.assertCountEqual(polled.reported_messages('students.csv'), [
+            "user John Doe has already claimed john_doe's requested login "
+            "information, skipping",
+            "Error while importing CSV. Please contact support."])
+        self.assertEqual(polled.canvas_warning_count, 1)
+        self.assertEqual(polled.canvas_error_count, 1)
+        self.assertIsNone(polled.canvas_warnings)
+        self.assertIsNone(polled.canvas_errors)
+        self.assertNotIn(polled, Import.objects.find_by_requires_update())
+
+        missing = Import.objects.get(pk=missing.pk)
+        self.assertIsNone(missing.monitor_status)
+        self.assertGreater(missing.monitor_next_date, missing.added_date)
+
+        # failed polls back off until the next one is due
+        self.assertNotIn(missing, Import.objects.find_by_requires_update())
+
+    def test_add_messages(self):
+        imp = Import.objects.create(csv_type='course', canvas_id='1')
+        ImportMessage.objects.create(
+            queue=imp, canvas_id='1', source=ImportMessage.SOURCE_SIS_ERROR,
+            message_type=ImportMessage.TYPE_ERROR,
+            csv_file='enrollments.csv', message='User not found')
+
+        # SIS errors stored by reload_enrollment_errors don't count
+        imp.add_messages([['courses.csv', 'warning']],
+                         [['courses.csv', 'error']])
+        imp.add_messages([['courses.csv', 'warning']],
+                         [['courses.csv', 'error']])
+
+        self.assertEqual(imp.messages.count(), 3)
+        self.assertCountEqual(
+            imp.reported_messages('courses.csv'), ['warning', 'error'])
+        self.assertEqual(imp.reported_messages('enrollments.csv'), [])
+
+    def test_schedule_next_monitor(self):
+        imp = Import(csv_type='course')
+        now = datetime.now(timezone.utc)
+
+        imp.schedule_next_monitor(now, 0)
+        self.assertEqual(imp.monitor_next_date, now + timedelta(seconds=30))
+
+        # 10% in 60s, 80% remaining
+        imp.monitor_date = now - timedelta(seconds=60)
+        imp.canvas_progress = 10
+        imp.schedule_next_monitor(now, 20)
+        self.assertEqual(imp.monitor_next_date, now + timedelta(seconds=480))
+
+        # stalled imports back off
+        imp.canvas_progress = 20
+        imp.schedule_next_monitor(now, 20)
+        self.assertEqual(imp.monitor_next_date, now + timedelta(seconds=120))
+
+        imp.monitor_date = now - timedelta(seconds=800)
+        imp.schedule_next_monitor(now, 20)
+        self.assertEqual(imp.monitor_next_date, now + timedelta(seconds=900))
+
+    def test_defer_monitor(self):
+        now = datetime.now(timezone.utc)
+        imp = Import.objects.create(csv_type='course', canvas_id='2')
+        imp.monitor_date = now - timedelta(seconds=100)
+
+        imp.defer_monitor()
+        self.assertAlmostEqual(
+            (imp.monitor_next_date - now).total_seconds(), 200, delta=5)
+
+        imp.monitor_date = now - timedelta(seconds=1000)
+        imp.defer_monitor()
+        self.assertAlmostEqual(
+            (imp.monitor_next_date - now).total_seconds(), 900, delta=5)
+        self.assertEqual(Import.objects.get(
+            pk=imp.pk).monitor_next_date, imp.monitor_next_date)
+
+    def test_find_by_requires_update_due(self):
+        now = datetime.now(timezone.utc)
+        due = Import.objects.create(
+            csv_type='course', canvas_id='1', post_status=200,
+            monitor_next_date=now - timedelta(seconds=1))
+        Import.objects.create(
+            csv_type='course', canvas_id='2', post_status=200,
+            monitor_next_date=now + timedelta(seconds=60))
+        unscheduled = Import.objects.create(
+            csv_type='course', canvas_id='3', post_status=200)
+
+        self.assertEqual(
+            set(Import.objects.find_by_requires_update()),
+            set([due, unscheduled]))
+
+    def test_dequeue_provisions_models(self):
+        self.call_load_training_courses()
+        imp = Course.objects.queue_by_priority(Course.PRIORITY_DEFAULT)
+        CourseBuilder(imp.queued_objects()).build()
+
+        imp.post_status = 200
+        imp.canvas_progress = 100
+        imp.canvas_state = 'imported'
+        imp.save()
+        imp.dequeue_dependent_models()
+
+        for model in [Course, Section, Enrollment]:
+            self.assertEqual(model.objects.filter(
+                provisioned_date__isnull=True).count(), 0)
+            self.assertEqual(model.objects.filter(
+                queue_id__isnull=False).count(), 0)
+
+        # training course changes are resent
+        training_course = Course.objects.first().training_course
+        training_course.save()
+        self.assertEqual(
+            Course.objects.filter(
+                training_course=training_course,
+                provisioned_date__isnull=True).count(),
+            training_course.course_count)
+
+    def test_dequeue_excludes_reported_models(self):
+        self.call_load_training_courses()
+        imp = Course.objects.queue_by_priority(Course.PRIORITY_DEFAULT)
+        CourseBuilder(imp.queued_objects()).build()
+
+        section = Section.objects.filter(
+            enrollment__isnull=False).first()
+        course = Course.objects.filter(section__isnull=True).exclude(
+            enrollment__isnull=True).first()
+
+        imp.post_status = 200
+        imp.canvas_progress = 100
+        imp.canvas_state = 'imported_with_messages'
+        imp.canvas_errors = json.dumps([
+            ['courses.csv', f'Improper status for course {course.course_id}'],
+            ['enrollments.csv', (
+                'User not found for enrollment (User ID: , Course ID: '
+                f'{section.course.course_id}, Section ID: '
+                f'{section.section_id})')],
+            ['sections.csv', 'Error while importing CSV.']])
+        imp.save()
+        imp.dequeue_dependent_models()
+
+        self.assertEqual(Course.objects.filter(
+            provisioned_date__isnull=True).get(), course)
+        self.assertEqual(Section.objects.filter(
+            provisioned_date__isnull=False).count(), 0)
+        self.assertEqual(
+            set(Enrollment.objects.filter(
+                provisioned_date__isnull=True).values_list(
+                    'section', flat=True)), {section.pk})
+        self.assertEqual(Enrollment.objects.filter(
+            provisioned_date__isnull=True).count(),
+            Enrollment.objects.filter(section=section).count())
+
+    def test_failed_import_not_provisioned(self):
+        self.call_load_training_courses()
+        imp = Course.objects.queue_by_priority(Course.PRIORITY_DEFAULT)
+        CourseBuilder(imp.queued_objects()).build()
+
+        imp.delete()
+
+        for model in [Course, Section, Enrollment]:
+            self.assertEqual(model.objects.filter(
+                provisioned_date__isnull=False).count(), 0)
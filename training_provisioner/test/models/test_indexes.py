@@ -0,0 +1,49 @@
+# Copyright 2026 UW-IT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+from django.db import connection
+from training_provisioner.test import TrainingCourseTestCase
+from training_provisioner.models import Import, ImportResource
+from training_provisioner.models.course import Course
+from training_provisioner.models.section import Section
+from training_provisioner.models.enrollment import Enrollment
+
+
+class QueryIndexTest(TrainingCourseTestCase):
+    def setUp(self):
+        self.call_load_training_courses()
+        if connection.vendor == 'postgresql':
+            # the test tables are too small for the planner to prefer
+            # an index on its own
+            with connection.cursor() as cursor:
+                cursor.execute('SET LOCAL enable_seqscan = off')
+
+    def assertUsesIndex(self, queryset, index_name):
+        plan = queryset.explain()
+        self.assertIn(index_name, plan, plan)
+
+    def test_queue_indexes(self):
+        self.assertUsesIndex(Course.objects.filter(
+            queue_id__isnull=True, priority=ImportResource.PRIORITY_DEFAULT,
+            provisioned_error__isnull=True), 'course_queue_idx')
+
+        for model, name in [(Section, 'section_import_idx'),
+                            (Enrollment, 'enrollment_import_idx')]:
+            self.assertUsesIndex(model.objects.filter(
+                queue_id__isnull=True, course__queue_id='1',
+                priority__gt=ImportResource.PRIORITY_NONE), name)
+
+    def test_dequeue_indexes(self):
+        for model, name in [(Course, 'course_queued_idx'),
+                            (Section, 'section_queued_idx'),
+                            (Enrollment, 'enrollment_queued_idx')]:
+            self.assertUsesIndex(model.objects.filter(queue_id='1'), name)
+
+    def test_eligibility_index(self):
+        self.assertUsesIndex(Enrollment.objects.filter(
+            integration_id='5432101', deleted_date__isnull=True),
+            'enrollment_active_idx')
+
+    def test_monitor_index(self):
+        self.assertUsesIndex(
+            Import.objects.find_by_requires_update(), 'import_monitor_idx')
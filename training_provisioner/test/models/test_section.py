@@ -5,6 +5,8 @@ from training_provisioner.test import TrainingCourseTestCase
 from training_provisioner.models.training_course import TrainingCourse
 from training_provisioner.models.course import Course
 from training_provisioner.models.section import Section
+from django.utils.timezone import localtime
+from datetime import timedelta
 
 
 class SectionModelTest(TrainingCourseTestCase):
@@ -27,3 +29,70 @@ class SectionModelTest(TrainingCourseTestCase):
 
             Course.objects.all().delete()
             Section.objects.all().delete()
+
+    def test_section_model_reshape(self):
+        training_course = TrainingCourse.objects.filter(
+            section_count__gt=0, course_count__gt=1).first()
+
+        with self.assertNumQueries(4):
+            courses = Course.objects.add_models_for_training_course(
+                training_course)
+        with self.assertNumQueries(5):
+            sections = Section.objects.add_models_for_training_course(
+                training_course)
+        self.assertEqual(len(courses), training_course.course_count)
+        self.assertEqual(len(sections), (
+            training_course.course_count * training_course.section_count))
+
+        with self.assertNumQueries(1):
+            self.assertEqual(Course.objects.add_models_for_training_course(
+                training_course), courses)
+        with self.assertNumQueries(2):
+            self.assertEqual(Section.objects.add_models_for_training_course(
+                training_course), sections)
+
+        # raising section_count adds the new sections in the same queries
+        section_count = training_course.section_count + 3
+        TrainingCourse.objects.filter(pk=training_course.pk).update(
+            section_count=section_count)
+        training_course.refresh_from_db()
+
+        with self.assertNumQueries(5):
+            reshaped = Section.objects.add_models_for_training_course(
+                training_course)
+        self.assertEqual(len(reshaped),
+                         training_course.course_count * section_count)
+        self.assertEqual(Section.objects.count(), len(reshaped))
+        self.assertEqual(
+            [s.section_ordinal for s in reshaped[:section_count]],
+            list(range(1, section_count + 1)))
+
+    def test_section_course_imports(self):
+        training_course = TrainingCourse.objects.filter(
+            section_count__gt=0, course_count__gt=1).first()
+        courses = Course.objects.add_models_for_training_course(
+            training_course)
+        Section.objects.add_models_for_training_course(training_course)
+
+        self.assertEqual(
+            set(Section.objects.course_imports(courses[:1]).values_list(
+                'course_id', flat=True)), {courses[0].pk})
+
+        Course.objects.filter(pk=courses[0].pk).update(queue_id='1')
+        self.assertEqual(
+            set(Section.objects.queue_course_imports('1').values_list(
+                'course_id', 'queue_id')), {(courses[0].pk, '1')})
+
+    def test_section_json_data(self):
+        training_course = TrainingCourse.objects.filter(
+            section_count__gt=0).first()
+        Course.objects.add_models_for_training_course(training_course)
+        Section.objects.add_models_for_training_course(training_course)
+
+        section = Section.objects.first()
+        section.deleted_date = localtime() + timedelta(days=1)
+        data = section.json_data()
+        self.assertEqual(data['created_date'],
+                         localtime(section.created_date).isoformat())
+        self.assertEqual(data['deleted_date'],
+                         localtime(section.deleted_date).isoformat())
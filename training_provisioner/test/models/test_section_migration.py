@@ -0,0 +1,81 @@
+# Copyright 2026 UW-IT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TransactionTestCase
+
+APP = 'training_provisioner'
+BEFORE = [(APP, '0016_enrollmenthistoryevent_timestamp_default')]
+AFTER = [(APP, '0018_section_course_section_id_uniq')]
+LOGGER = f'{APP}.migrations.0017_merge_duplicate_sections'
+
+
+class SectionUniqueMigrationTest(TransactionTestCase):
+    def migrate(self, targets):
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate(targets)
+        return executor.loader.project_state(targets).apps
+
+    def tearDown(self):
+        executor = MigrationExecutor(connection)
+        self.migrate(executor.loader.graph.leaf_nodes())
+
+    def test_merge_duplicate_sections(self):
+        apps = self.migrate(BEFORE)
+        TrainingCourse = apps.get_model(APP, 'TrainingCourse')
+        Course = apps.get_model(APP, 'Course')
+        Section = apps.get_model(APP, 'Section')
+        Enrollment = apps.get_model(APP, 'Enrollment')
+        EnrollmentHistoryEvent = apps.get_model(APP, 'EnrollmentHistoryEvent')
+
+        training_course = TrainingCourse.objects.create(
+            course_name='Training', blueprint_course_id='BLUEPRINT_1',
+            term_id='2026-spring', account_id='account', section_count=1)
+        course = Course.objects.create(
+            training_course=training_course, course_id='COURSE-001',
+            course_ordinal=1)
+        kept, extra, other = [Section.objects.create(
+            course=course, section_id=section_id, section_ordinal=1)
+            for section_id in ['COURSE-001-A', 'COURSE-001-A',
+                               'COURSE-001-B']]
+
+        # the same student in both duplicates, and one in only the extra
+        kept_enrollment, merged, moved = [Enrollment.objects.create(
+            course=course, section=section, integration_id=integration_id)
+            for section, integration_id in [(kept, '1000001'),
+                                            (extra, '1000001'),
+                                            (extra, '1000002')]]
+        for enrollment in [kept_enrollment, merged, moved]:
+            EnrollmentHistoryEvent.objects.create(
+                enrollment=enrollment, event_type='created',
+                integration_id=enrollment.integration_id,
+                course_id=course.course_id)
+
+        with self.assertLogs(LOGGER, 'WARNING') as logs:
+            apps = self.migrate(AFTER)
+
+        self.assertEqual(logs.output, [
+            f'WARNING:{LOGGER}:Merged enrollment {merged.pk} into '
+            f'{kept_enrollment.pk}',
+            f'WARNING:{LOGGER}:Merged section {extra.pk} into {kept.pk} '
+            f'(course {course.pk}, COURSE-001-A)'])
+
+        Section = apps.get_model(APP, 'Section')
+        Enrollment = apps.get_model(APP, 'Enrollment')
+        EnrollmentHistoryEvent = apps.get_model(APP, 'EnrollmentHistoryEvent')
+        self.assertEqual(set(Section.objects.values_list('pk', flat=True)),
+                         {kept.pk, other.pk})
+        self.assertEqual(
+            set(Enrollment.objects.values_list('pk', 'section_id')),
+            {(kept_enrollment.pk, kept.pk), (moved.pk, kept.pk)})
+        self.assertEqual(EnrollmentHistoryEvent.objects.filter(
+            enrollment=kept_enrollment.pk).count(), 2)
+
+        # reversing drops the constraint, leaving the merged rows
+        apps = self.migrate(BEFORE)
+        Section = apps.get_model(APP, 'Section')
+        Section.objects.create(
+            course_id=course.pk, section_id='COURSE-001-B', section_ordinal=2)
+        self.assertEqual(Section.objects.count(), 3)
@@ -5,6 +5,7 @@ from training_provisioner.test import TrainingCourseTestCase
 from training_provisioner.models.training_course import TrainingCourse
 from training_provisioner.models.course import Course
 from mock import patch
+import numpy as np
 
 
 class TrainingCourseModelTest(TrainingCourseTestCase):
@@ -50,3 +51,45 @@ class TrainingCourseModelTest(TrainingCourseTestCase):
         self.assertEqual(Course.objects.filter(
             training_course=training_course,
             priority__gt=Course.PRIORITY_NONE).count(), updated)
+
+    def assertAssignments(self, training_course, integration_ids):
+        course_ids, section_ids = (
+            training_course.get_course_and_section_ids_for_members(
+                integration_ids))
+        self.assertEqual(len(course_ids), len(integration_ids))
+        self.assertEqual(len(section_ids), len(integration_ids))
+
+        for integration_id, course_id, section_id in zip(
+                integration_ids, course_ids, section_ids):
+            expected_course_id = training_course.get_course_id_for_member(
+                integration_id)
+            course = Course(
+                course_id=expected_course_id, training_course=training_course)
+            self.assertEqual(course_id, expected_course_id)
+            self.assertEqual(
+                section_id, course.get_section_id_for_member(integration_id))
+
+    def test_course_and_section_ids_for_members(self):
+        training_course = TrainingCourse.objects.get(pk=1)
+        training_course.course_count = 7
+        integration_ids = [f"{i:07d}" for i in range(0, 10000000, 9973)]
+        integration_ids += ['0000001', '99999999', '1', '5432101']
+
+        for section_count in [0, 1, 5, 26, 27, 60, 702]:
+            training_course.section_count = section_count
+            self.assertAssignments(training_course, integration_ids)
+
+        # ints, mixed lengths and ids that are not plain digits
+        training_course.section_count = 3
+        self.assertAssignments(training_course, [5432101, 123, 9999999])
+        self.assertAssignments(training_course, ['5432101', 42, '007'])
+        self.assertAssignments(training_course, [' 5432101', '+12', '1_0'])
+        self.assertAssignments(training_course, ['1' * 19, '٣'])
+        self.assertAssignments(training_course, [])
+        self.assertAssignments(training_course, [b'5432101'])
+        self.assertAssignments(
+            training_course, np.array(integration_ids)[::3])
+
+        self.assertRaises(
+            ValueError, training_course.get_course_and_section_ids_for_members,
+            ['5432101', 'abc'])
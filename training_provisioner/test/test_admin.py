@@ -6,7 +6,16 @@ from django.test import TestCase, RequestFactory, override_settings
 from django.urls import reverse
 from django.contrib.sessions.middleware import SessionMiddleware
 from django.contrib.auth.models import User
-from training_provisioner.admin import admin_site
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from training_provisioner.admin import admin_site, EstimatedCountPaginator
+from training_provisioner.models import Import
+from training_provisioner.models.course import Course
+from training_provisioner.models.enrollment import (
+    Enrollment, EnrollmentHistoryEvent)
+from training_provisioner.models.training_course import TrainingCourse
+from training_provisioner.test import TrainingCourseTestCase
+from tempfile import TemporaryDirectory
 import mock
 
 
@@ -61,6 +70,16 @@ class AdminSiteIndexTest(TestCase):
 
         self.assertEqual(response.status_code, 200)
 
+    def test_admin_view_group_checked_once(self):
+        self.saml_user_data['isMemberOf'] = ['u_acadev_unittest']
+        with mock.patch('training_provisioner.dao.group.is_member_of_group',
+                        return_value=True) as is_member_of_group:
+            response = admin_site.index(self.request)
+
+        self.assertEqual(response.status_code, 200)
+        is_member_of_group.assert_called_once_with(
+            self.request, 'u_acadev_unittest')
+
     def test_unauthorized_admin_view(self):
         self.saml_user_data['isMemberOf'] = ['uw_member']
         response = admin_site.index(self.request)
@@ -70,3 +89,145 @@ class AdminSiteIndexTest(TestCase):
             (b'You don\xe2\x80\x99t have permission '
              b'to view or edit anything').decode('utf-8'),
             status_code=200)
+
+
+@override_settings(
+    RESTCLIENTS_CANVAS_ACCOUNT_ID=123,
+    STUDENTTRAINING_ADMIN_GROUP='u_acadev_unittest')
+class AdminChangelistTest(TrainingCourseTestCase):
+    def setUp(self):
+        self.call_load_training_courses()
+        self.user = User.objects.create_user(username='jstaff')
+
+    def changelist_request(self, model, **params):
+        request = RequestFactory().get(
+            reverse('admin:training_provisioner_{}_changelist'.format(
+                model._meta.model_name)), params,
+            HTTP_HOST='example.uw.edu')
+        SessionMiddleware(mock.MagicMock())(request)
+        request.user = self.user
+        request.session['samlUserdata'] = {
+            'uwnetid': ['jstaff'], 'isMemberOf': ['u_acadev_unittest']}
+        return request
+
+    def changelist_queries(self, model, **params):
+        model_admin = admin_site._registry[model]
+        with CaptureQueriesContext(connection) as queries:
+            response = model_admin.changelist_view(
+                self.changelist_request(model, **params))
+            response.render()
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def test_enrollment_changelist(self):
+        enrollments = Enrollment.objects.order_by('pk')
+        self.assertGreater(enrollments.count(), 2)
+        self.changelist_queries(Enrollment)
+        queries = self.changelist_queries(Enrollment)
+
+        enrollments.exclude(pk=enrollments.first().pk).delete()
+        self.assertEqual(self.changelist_queries(Enrollment), queries)
+
+        integration_id = enrollments.first().integration_id
+        self.changelist_queries(Enrollment, q=integration_id[:4])
+
+    def test_history_changelist(self):
+        events = EnrollmentHistoryEvent.objects.order_by('pk')
+        self.assertGreater(events.count(), 2)
+        self.changelist_queries(EnrollmentHistoryEvent)
+        queries = self.changelist_queries(EnrollmentHistoryEvent)
+
+        events.exclude(pk=events.first().pk).delete()
+        self.assertEqual(
+            self.changelist_queries(EnrollmentHistoryEvent), queries)
+
+    def test_enrollment_actions(self):
+        model_admin = admin_site._registry[Enrollment]
+        request = self.changelist_request(Enrollment)
+        request._messages = mock.MagicMock()
+        enrollments = Enrollment.objects.filter(integration_id='5432101')
+
+        with self.assertNumQueries(4):
+            model_admin.delete_enrollments(request, enrollments)
+        self.assertFalse(enrollments.filter(
+            deleted_date__isnull=True).exists())
+
+    def test_training_course_actions(self):
+        training_course = TrainingCourse.objects.get(pk=1)
+        model_admin = admin_site._registry[TrainingCourse]
+        request = self.changelist_request(TrainingCourse)
+        request._messages = mock.MagicMock()
+
+        model_admin.bump_enrollments(
+            request, TrainingCourse.objects.filter(pk=training_course.pk))
+        enrollments = Enrollment.objects.filter(
+            course__training_course=training_course)
+        self.assertTrue(enrollments.exists())
+        self.assertFalse(enrollments.exclude(
+            priority=Enrollment.PRIORITY_IMMEDIATE).exists())
+        self.assertFalse(Course.objects.filter(
+            training_course=training_course).exclude(
+                priority=Course.PRIORITY_IMMEDIATE).exists())
+
+        model_admin = admin_site._registry[Course]
+        model_admin.reprovision_enrollments(request, Course.objects.filter(
+            training_course=training_course))
+        self.assertFalse(enrollments.exclude(
+            priority=Enrollment.PRIORITY_DEFAULT).exists())
+
+    @mock.patch('training_provisioner.models.sis_import_by_path')
+    def test_bump_enrollments_import(self, mock_import):
+        mock_import.return_value = mock.Mock(
+            import_id='1', workflow_state='created')
+        training_course = TrainingCourse.objects.get(pk=1)
+        model_admin = admin_site._registry[TrainingCourse]
+        request = self.changelist_request(TrainingCourse)
+        request._messages = mock.MagicMock()
+        Course.objects.update(priority=Course.PRIORITY_NONE)
+        Enrollment.objects.update(priority=Enrollment.PRIORITY_NONE)
+        courses = Course.objects.filter(training_course=training_course)
+        enrollments = Enrollment.objects.filter(
+            course__training_course=training_course)
+
+        # bumped enrollments are imported right away
+        with TemporaryDirectory() as media_root, self.settings(
+                MEDIA_ROOT=media_root, TRAINING_IMPORT_CSV_DEBUG=False):
+            model_admin.bump_enrollments(
+                request, TrainingCourse.objects.filter(pk=training_course.pk))
+        imp = Import.objects.get(priority=Course.PRIORITY_IMMEDIATE)
+        self.assertEqual(set(courses.values_list('queue_id', flat=True)),
+                         {str(imp.pk)})
+
+        imp.post_status = 200
+        imp.canvas_progress = 100
+        imp.canvas_state = 'imported'
+        imp.save()
+        imp.dequeue_dependent_models()
+        self.assertFalse(courses.exclude(
+            priority=Course.PRIORITY_NONE).exists())
+        self.assertFalse(enrollments.exclude(
+            priority=Enrollment.PRIORITY_NONE).exists())
+
+        # a later enrollment queues its course for the scheduled import
+        enrollment = enrollments.order_by('pk').first()
+        enrollment.delete()
+        Enrollment.objects._add_enrollment(
+            enrollment.integration_id, training_course)
+
+        imp = Course.objects.queue_by_priority(Course.PRIORITY_DEFAULT)
+        self.assertEqual(list(imp.queued_objects()), [enrollment.course])
+        self.assertEqual(list(Enrollment.objects.queue_course_imports(
+            imp.pk).values_list('integration_id', flat=True)),
+            [enrollment.integration_id])
+
+    def test_estimated_count_paginator(self):
+        paginator = EstimatedCountPaginator(
+            Enrollment.objects.order_by('pk'), 100)
+        self.assertEqual(paginator.count, Enrollment.objects.count())
+
+        if connection.vendor == 'postgresql':
+            paginator = EstimatedCountPaginator(
+                Enrollment.objects.order_by('pk'), 100)
+            paginator.EXACT_COUNT_THRESHOLD = 0
+            with self.assertNumQueries(1):
+                self.assertGreaterEqual(paginator.count, 0)
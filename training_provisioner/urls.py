@@ -5,7 +5,8 @@ from django.urls import re_path
 from django.views.generic.base import TemplateView
 from training_provisioner.admin import admin_site
 from training_provisioner.views.index import IndexView
-from training_provisioner.views.api.enrollments import Enrollments
+from training_provisioner.views.api.enrollments import (
+    Enrollments, StudentEnrollments, TrainingCourseEnrollments)
 from training_provisioner.views.api.imports import ImportView, ImportListView
 
 
@@ -19,6 +20,11 @@ urlpatterns = [
     ),
     re_path('api/v1/student/(?P<integration_id>[0-9]{7})/enrollments/?',
             Enrollments.as_view(), name='student_enrollments'),
+    re_path(r'api/v1/students/enrollments/?$',
+            StudentEnrollments.as_view(), name='students_enrollments'),
+    re_path(r'api/v1/training_course/(?P<training_course_id>[0-9]+)'
+            r'/enrollments/?$', TrainingCourseEnrollments.as_view(),
+            name='training_course_enrollments'),
     re_path(r'api/v1/import/(?P<import_id>[0-9]+)?$',
             ImportView.as_view(), name='import_view'),
     re_path(r'api/v1/imports/?$',
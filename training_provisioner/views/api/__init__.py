@@ -2,10 +2,11 @@
 # SPDX-License-Identifier: Apache-2.0
 
 from django.http import HttpResponse, JsonResponse
-from rest_framework.authentication import TokenAuthentication
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.views import APIView
 from rest_framework.exceptions import APIException
+from training_provisioner.views.api.authentication import (
+    CachedTokenAuthentication)
 
 
 class StudentTrainingAPI(APIView):
@@ -13,7 +14,7 @@ class StudentTrainingAPI(APIView):
         API base class providing authentication and permission
     """
 
-    authentication_classes = (TokenAuthentication,)
+    authentication_classes = (CachedTokenAuthentication,)
     permission_classes = (IsAuthenticated,)
 
     def json_response(self, data, status=200):
@@ -0,0 +1,34 @@
+# Copyright 2026 UW-IT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.exceptions import AuthenticationFailed
+
+
+def token_cache_key(key):
+    return f"api_token:{key}"
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+        TokenAuthentication that keeps validated tokens, with their user,
+        in the django cache for API_TOKEN_CACHE_TIMEOUT seconds. Entries
+        are dropped by the token and user signal handlers, which only
+        reach processes sharing the cache backend; elsewhere a revoked
+        token keeps working until its entry expires, so keep the timeout
+        short.
+    """
+
+    def authenticate_credentials(self, key):
+        cache_key = token_cache_key(key)
+        token = cache.get(cache_key)
+        if token is None:
+            user, token = super().authenticate_credentials(key)
+            cache.set(cache_key, token, timeout=getattr(
+                settings, 'API_TOKEN_CACHE_TIMEOUT', 60))
+        elif not token.user.is_active:
+            raise AuthenticationFailed('User inactive or deleted.')
+
+        return (token.user, token)
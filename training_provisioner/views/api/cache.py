@@ -0,0 +1,56 @@
+# Copyright 2026 UW-IT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+from django.conf import settings
+from django.core.cache import cache
+from uuid import uuid4
+
+VERSION_KEY = 'enrollments_version'
+
+
+def student_version_key(integration_id):
+    return f"{VERSION_KEY}:{integration_id}"
+
+
+def response_key(integration_id, version):
+    return f"enrollments_response:{integration_id}:{version}"
+
+
+def cache_timeout():
+    return getattr(settings, 'API_RESPONSE_CACHE_TIMEOUT', 60 * 60 * 24)
+
+
+def enrollments_version(integration_id):
+    """
+    Returns the version of a student's enrollment data, made up of the
+    global version bumped by course changes and queryset updates, and
+    the student's own version bumped by changes to their enrollments.
+    """
+    keys = [VERSION_KEY, student_version_key(integration_id)]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            version = uuid4().hex
+            cache.add(key, version, timeout=cache_timeout())
+            versions[key] = cache.get(key, version)
+
+    return '.'.join([versions[key] for key in keys])
+
+
+def invalidate_enrollments(integration_id=None):
+    """
+    Bumps the version of the given student's enrollment data or, when
+    integration_id is None, of every student's.
+    """
+    key = (VERSION_KEY if integration_id is None else
+           student_version_key(integration_id))
+    cache.set(key, uuid4().hex, timeout=cache_timeout())
+
+
+def get_enrollments_response(integration_id, version):
+    return cache.get(response_key(integration_id, version))
+
+
+def set_enrollments_response(integration_id, version, content):
+    cache.set(response_key(integration_id, version), content,
+              timeout=cache_timeout())
@@ -1,16 +1,203 @@
 # Copyright 2026 UW-IT, University of Washington
 # SPDX-License-Identifier: Apache-2.0
 
+from django.conf import settings
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
+from django.utils.timezone import localtime
 from training_provisioner.views.api import StudentTrainingAPI
+from training_provisioner.views.api.cache import (
+    enrollments_version, get_enrollments_response, set_enrollments_response)
+from training_provisioner.models.training_course import TrainingCourse
 from training_provisioner.models.enrollment import Enrollment
+from itertools import groupby
+from operator import attrgetter
+import csv
+import json
+import re
+
+
+class EnrollmentSerializer(object):
+    """
+    Serializes enrollments, serializing each course and section once and
+    sharing the result between the enrollments and sections that refer
+    to it.
+    """
+    def __init__(self):
+        self.courses = {}
+        self.sections = {}
+
+    def json_data(self, enrollment):
+        course = enrollment.course
+        if course.pk not in self.courses:
+            self.courses[course.pk] = course.json_data()
+
+        section = enrollment.section
+        if section is not None and section.pk not in self.sections:
+            if section.course_id == course.pk:
+                section.course = course
+            self.sections[section.pk] = section.json_data(
+                course_data=self.courses.get(section.course_id))
+
+        return enrollment.json_data(
+            course_data=self.courses[course.pk],
+            section_data=self.sections.get(enrollment.section_id))
+
+
+def enrollments_for(integration_ids):
+    return Enrollment.objects.filter(
+        integration_id__in=integration_ids).select_related(
+            'course__training_course', 'section')
 
 
 class Enrollments(StudentTrainingAPI):
+    """ Retrieves a student's enrollments.
+        Responses are cached by the version of the student's enrollment
+        data, which is also their ETag, so an unchanged poll returns 304.
+    """
     def get(self, request, *args, **kwargs):
         try:
             integration_id = kwargs.get('integration_id')
-            enrollments = Enrollment.objects.filter(
-                integration_id=integration_id)
-            return self.json_response([e.json_data() for e in enrollments])
+            version = enrollments_version(integration_id)
+            etag = quote_etag(version)
+
+            response = get_conditional_response(request, etag=etag)
+            if response is None:
+                content = get_enrollments_response(integration_id, version)
+                if content is None:
+                    serializer = EnrollmentSerializer()
+                    content = json.dumps([serializer.json_data(e) for e in (
+                        enrollments_for([integration_id]).order_by('pk'))])
+                    set_enrollments_response(
+                        integration_id, version, content)
+
+                response = HttpResponse(
+                    content, content_type='application/json')
+
+            response['ETag'] = etag
+            return response
         except Exception as ex:
             return self.error_response(str(ex))
+
+
+class StudentEnrollments(StudentTrainingAPI):
+    """ Retrieves enrollments for a batch of students.
+        POST {"integration_ids": [...]} returns 200 with a json object
+        mapping each integration_id to its list of enrollments.
+    """
+    CHUNK_SIZE = 2000
+
+    def post(self, request, *args, **kwargs):
+        max_ids = getattr(settings, 'STUDENT_ENROLLMENTS_MAX_IDS', 10000)
+
+        try:
+            integration_ids = json.loads(request.body)['integration_ids']
+            if not isinstance(integration_ids, list):
+                raise ValueError()
+        except (KeyError, TypeError, ValueError):
+            return self.error_response(
+                'Expected {"integration_ids": [...]}', 400)
+
+        integration_ids = sorted(set([str(i) for i in integration_ids]))
+        if len(integration_ids) > max_ids:
+            return self.error_response(
+                f'At most {max_ids} integration_ids per request', 400)
+
+        for integration_id in integration_ids:
+            if not re.match(r'^[0-9]{7}$', integration_id):
+                return self.error_response(
+                    f'Invalid integration_id {integration_id}', 400)
+
+        return StreamingHttpResponse(
+            self.stream_enrollments(integration_ids),
+            content_type='application/json')
+
+    def stream_enrollments(self, integration_ids):
+        serializer = EnrollmentSerializer()
+        enrollments = groupby(enrollments_for(integration_ids).order_by(
+            'integration_id', 'pk').iterator(chunk_size=self.CHUNK_SIZE),
+            key=attrgetter('integration_id'))
+        next_id, next_enrollments = next(enrollments, (None, ()))
+
+        # integration_ids and enrollments are both in integration_id order
+        yield '{'
+        for i, integration_id in enumerate(integration_ids):
+            student_enrollments = []
+            if integration_id == next_id:
+                student_enrollments = [
+                    serializer.json_data(e) for e in next_enrollments]
+                next_id, next_enrollments = next(enrollments, (None, ()))
+
+            yield '{}{}: {}'.format(
+                ', ' if i else '', json.dumps(integration_id),
+                json.dumps(student_enrollments))
+        yield '}'
+
+
+class Echo(object):
+    def write(self, value):
+        return value
+
+
+class TrainingCourseEnrollments(StudentTrainingAPI):
+    """ Exports the enrollment roster of a training course.
+        GET streams one row per enrollment as NDJSON, or as CSV when
+        output=csv, returning 404 for an unknown training course.
+    """
+    CHUNK_SIZE = 2000
+    HEADER = ['integration_id', 'course_id', 'section_id', 'eligible_terms',
+              'is_active', 'created_date', 'provisioned_date',
+              'deleted_date']
+
+    def get(self, request, *args, **kwargs):
+        training_course_id = kwargs.get('training_course_id')
+        output = request.GET.get('output', 'ndjson')
+        if output not in ['ndjson', 'csv']:
+            return self.error_response(f'Invalid output {output}', 400)
+
+        if not TrainingCourse.objects.filter(pk=training_course_id).exists():
+            return self.error_response(
+                f'Training course {training_course_id} not found', 404)
+
+        rows = self.roster_rows(training_course_id)
+        if output == 'csv':
+            response = StreamingHttpResponse(
+                self.stream_csv(rows), content_type='text/csv')
+            response['Content-Disposition'] = (
+                'attachment; filename="training_course_'
+                f'{training_course_id}_enrollments.csv"')
+            return response
+
+        return StreamingHttpResponse(
+            self.stream_ndjson(rows), content_type='application/x-ndjson')
+
+    def roster_rows(self, training_course_id):
+        for (integration_id, course_id, section_id, eligible_terms,
+                created_date, provisioned_date, deleted_date) in (
+                Enrollment.objects.filter(
+                    course__training_course_id=training_course_id
+                ).order_by('pk').values_list(
+                    'integration_id', 'course__course_id',
+                    'section__section_id', 'eligible_terms', 'created_date',
+                    'provisioned_date', 'deleted_date'
+                ).iterator(chunk_size=self.CHUNK_SIZE)):
+            yield [integration_id, course_id, section_id,
+                   eligible_terms or [], deleted_date is None,
+                   self.isoformat(created_date),
+                   self.isoformat(provisioned_date),
+                   self.isoformat(deleted_date)]
+
+    def isoformat(self, date):
+        return localtime(date).isoformat() if date is not None else None
+
+    def stream_ndjson(self, rows):
+        for row in rows:
+            yield json.dumps(dict(zip(self.HEADER, row))) + '\n'
+
+    def stream_csv(self, rows):
+        writer = csv.writer(Echo())
+        yield writer.writerow(self.HEADER)
+        for row in rows:
+            row[3] = ' '.join(row[3])
+            yield writer.writerow(row)
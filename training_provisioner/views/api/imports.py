@@ -2,9 +2,14 @@
 # SPDX-License-Identifier: Apache-2.0
 
 
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
 from training_provisioner.models import Import
 from training_provisioner.views.api import StudentTrainingAPI
+from base64 import urlsafe_b64encode, urlsafe_b64decode
 from logging import getLogger
+import binascii
+import json
 
 logger = getLogger(__name__)
 
@@ -50,19 +55,100 @@ class ImportView(StudentTrainingAPI):
 
 class ImportListView(StudentTrainingAPI):
     """ Retrieves a list of Imports at /api/v1/imports/?<criteria[&criteria]>.
+        Criteria are state, priority, csv_type, added_after and
+        added_before.  Imports are ordered by added_date, and all of them
+        are returned unless limit or cursor is passed, in which case they
+        are returned in pages of at most limit, DEFAULT_LIMIT if not
+        given, with a next cursor for the following page.
+        The large csv_errors, canvas_warnings and canvas_errors columns are
+        only included when named in the fields parameter.
         GET returns 200 with Import details.
     """
+    DEFAULT_LIMIT = 100
+    MAX_LIMIT = 1000
+
     def get(self, request, *args, **kwargs):
-        json_rep = {
-            'imports': []
-        }
+        params = request.GET
 
         try:
-            import_list = Import.objects.all().order_by('added_date')
+            import_list = self.filter_imports(params)
+            limit = self.page_limit(params)
+            cursor = params.get('cursor')
+            if cursor:
+                added_date, pk = self.decode_cursor(cursor)
+                import_list = import_list.filter(
+                    Q(added_date__gt=added_date) |
+                    Q(added_date=added_date, pk__gt=pk))
+
+            fields = set(params.get('fields', '').split(','))
+            exclude = [f for f in Import.TEXT_FIELDS if f not in fields]
         except ImportInvalidException as err:
-            return self.error_response(400, err)
+            return self.error_response(str(err), 400)
+
+        import_list = import_list.defer(*exclude).order_by('added_date', 'pk')
+        if limit is not None:
+            import_list = import_list[:limit + 1]
+        imports = list(import_list)
+
+        next_cursor = None
+        if limit is not None and len(imports) > limit:
+            imports = imports[:limit]
+            next_cursor = self.encode_cursor(imports[-1])
+
+        return self.json_response({
+            'imports': [imp.json_data(exclude=exclude) for imp in imports],
+            'next': next_cursor,
+        })
+
+    def filter_imports(self, params):
+        import_list = Import.objects.all()
+
+        if params.get('state'):
+            import_list = import_list.filter(
+                canvas_state__in=params.get('state').split(','))
+
+        if params.get('csv_type'):
+            import_list = import_list.filter(
+                csv_type__in=params.get('csv_type').split(','))
+
+        if params.get('priority'):
+            try:
+                import_list = import_list.filter(
+                    priority=int(params.get('priority')))
+            except ValueError:
+                raise ImportInvalidException('Invalid priority')
+
+        for param, lookup in [('added_after', 'added_date__gte'),
+                              ('added_before', 'added_date__lt')]:
+            if params.get(param):
+                added_date = parse_datetime(params.get(param))
+                if added_date is None:
+                    raise ImportInvalidException(f'Invalid {param}')
+                import_list = import_list.filter(**{lookup: added_date})
+
+        return import_list
+
+    def page_limit(self, params):
+        if not (params.get('limit') or params.get('cursor')):
+            return None
+
+        try:
+            limit = int(params.get('limit', self.DEFAULT_LIMIT))
+        except ValueError:
+            raise ImportInvalidException('Invalid limit')
+
+        return min(max(limit, 1), self.MAX_LIMIT)
 
-        for imp in import_list:
-            json_rep['imports'].append(imp.json_data())
+    def encode_cursor(self, imp):
+        return urlsafe_b64encode(json.dumps(
+            [imp.added_date.isoformat(), imp.pk]).encode()).decode()
 
-        return self.json_response(json_rep)
+    def decode_cursor(self, cursor):
+        try:
+            added_date, pk = json.loads(urlsafe_b64decode(cursor.encode()))
+            added_date = parse_datetime(added_date)
+            if added_date is None:
+                raise ValueError()
+            return added_date, int(pk)
+        except (TypeError, ValueError, binascii.Error):
+            raise ImportInvalidException('Invalid cursor')